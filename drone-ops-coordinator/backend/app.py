@@ -1,25 +1,27 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
+import argparse
 import os
 import sys
-from dotenv import load_dotenv
+import uuid
 import logging
+import orjson
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from config import Config
-from services.sheets_service import SheetsService
+from config import get_config
+from services.sheets_service import SHEET_NAMES, SheetsService
 from services.assignment_service import AssignmentService
 from services.conflict_service import ConflictService
 from services.agent_service import AgentService
 
-# Load environment variables
-load_dotenv()
+# Load configuration (reads .env once)
+CFG = get_config()
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=CFG.LOG_LEVEL,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
@@ -28,18 +30,22 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
+# Cookie identifying a client's conversation with the agent
+SESSION_COOKIE = 'chat_session_id'
+
 # Initialize services
 try:
-    Config.validate()
+    CFG.validate()
     
     sheets_service = SheetsService()
     assignment_service = AssignmentService(sheets_service)
     conflict_service = ConflictService(sheets_service)
+    conflict_service.start_background_refresh()
     agent_service = AgentService(sheets_service, assignment_service, conflict_service)
     
     logger.info("All services initialized successfully")
 except Exception as e:
-    logger.error(f"Failed to initialize services: {str(e)}")
+    logger.error("Failed to initialize services: %s", e)
     sys.exit(1)
 
 # Health check endpoint
@@ -47,8 +53,8 @@ except Exception as e:
 def health():
     """Health check endpoint"""
     try:
-        # Test Google Sheets connection
-        pilots = sheets_service.get_pilot_roster()
+        # Test Google Sheets connection (served from a recent fetch when possible)
+        counts = sheets_service.ping()
         
         return jsonify({
             "status": "healthy",
@@ -57,7 +63,7 @@ def health():
                 "gemini_api": "configured"
             },
             "data": {
-                "pilots": len(pilots),
+                "pilots": counts["pilots"],
             }
         }), 200
     except Exception as e:
@@ -77,43 +83,78 @@ def chat():
         if not message:
             return jsonify({"error": "Message is required"}), 400
         
-        logger.info(f"Received message: {message}")
+        logger.info("Received message: %s", message)
         
         # Get AI response
-        response = agent_service.chat(message)
+        session_id = _session_id()
+        response = agent_service.chat(message, session_id)
         
-        return jsonify({
+        return _with_session(jsonify({
             "response": response,
             "status": "success"
-        }), 200
+        }), session_id), 200
         
     except Exception as e:
-        logger.error(f"Error in chat endpoint: {str(e)}")
+        logger.error("Error in chat endpoint: %s", e)
         return jsonify({
             "error": str(e),
             "status": "error"
         }), 500
 
+# Streaming chat endpoint (Server-Sent Events)
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """Conversational endpoint that streams the reply as it is generated"""
+    data = request.json or {}
+    message = data.get('message', '')
+    
+    if not message:
+        return jsonify({"error": "Message is required"}), 400
+    
+    logger.info("Received streamed message: %s", message)
+    session_id = _session_id()
+    
+    def generate():
+        # Comment frame first, so headers reach the client before Gemini replies
+        yield b": stream open\n\n"
+        for text in agent_service.chat_stream(message, session_id):
+            yield b"data: " + orjson.dumps({'text': text}) + b"\n\n"
+        yield b"event: done\ndata: {}\n\n"
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Don't let nginx buffer the stream
+    return _with_session(response, session_id)
+
 # Reset conversation endpoint
 @app.route('/api/chat/reset', methods=['POST'])
 def reset_chat():
     """Reset conversation history"""
     try:
-        agent_service.reset_conversation()
-        return jsonify({
+        session_id = _session_id()
+        agent_service.reset_conversation(session_id)
+        return _with_session(jsonify({
             "status": "success",
             "message": "Conversation reset"
-        }), 200
+        }), session_id), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def _session_id() -> str:
+    """Conversation id from the request cookie, or a new one"""
+    return request.cookies.get(SESSION_COOKIE) or uuid.uuid4().hex
+
+def _with_session(response, session_id: str):
+    """Attach the conversation cookie to a response"""
+    response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite='Lax')
+    return response
+
 # Data endpoints for direct access (optional)
 @app.route('/api/pilots', methods=['GET'])
 def get_pilots():
     """Get all pilots"""
     try:
-        df = sheets_service.get_pilot_roster()
-        return jsonify(df.to_dict(orient='records')), 200
+        return Response(sheets_service.get_pilot_roster_json(), mimetype='application/json'), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -121,8 +162,7 @@ def get_pilots():
 def get_drones():
     """Get all drones"""
     try:
-        df = sheets_service.get_drone_fleet()
-        return jsonify(df.to_dict(orient='records')), 200
+        return Response(sheets_service.get_drone_fleet_json(), mimetype='application/json'), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -130,8 +170,7 @@ def get_drones():
 def get_missions():
     """Get all missions"""
     try:
-        df = sheets_service.get_missions()
-        return jsonify(df.to_dict(orient='records')), 200
+        return Response(sheets_service.get_missions_json(), mimetype='application/json'), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -139,11 +178,21 @@ def get_missions():
 def get_conflicts():
     """Get all conflicts"""
     try:
-        conflicts = conflict_service.detect_all_conflicts()
+        conflicts = conflict_service.get_conflicts()
         return jsonify(conflicts), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/sheets/refresh', methods=['POST'])
+def refresh_sheets():
+    """Re-read sheets edited outside the app instead of waiting for the cache TTL"""
+    sheet = (request.get_json(silent=True) or {}).get('sheet')
+    if sheet and sheet not in SHEET_NAMES:
+        return jsonify({"error": f"Unknown sheet: {sheet}"}), 400
+    
+    sheets_service.refresh(sheet)
+    return jsonify({"refreshed": [sheet] if sheet else list(SHEET_NAMES)}), 200
+
 @app.route('/api/pilots/<pilot_id>/assign', methods=['POST'])
 def assign_pilot(pilot_id):
     """Assign pilot to mission"""
@@ -177,8 +226,17 @@ def internal_error(e):
     return jsonify({"error": "Internal server error"}), 500
 
 if __name__ == '__main__':
-    port = Config.PORT
-    debug = Config.DEBUG
+    # Production runs under gunicorn (see wsgi.py / gunicorn.conf.py);
+    # the Flask development server is opt-in
+    parser = argparse.ArgumentParser(description="Drone Ops Coordinator API")
+    parser.add_argument('--dev', action='store_true', help="Run the Flask development server")
+    args = parser.parse_args()
+    
+    if not args.dev:
+        parser.exit(1, "Run under gunicorn (gunicorn -c gunicorn.conf.py wsgi:app) or pass --dev\n")
+    
+    port = CFG.PORT
+    debug = CFG.DEBUG
     
-    logger.info(f"Starting server on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=debug)
+    logger.info("Starting development server on port %s", port)
+    app.run(host='0.0.0.0', port=port, debug=debug, threaded=True)
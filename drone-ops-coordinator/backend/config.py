@@ -1,35 +1,75 @@
+import json
 import os
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
 from dotenv import load_dotenv
 
-load_dotenv()
-
+@dataclass(frozen=True, slots=True)
 class Config:
     """Application configuration"""
-    
+
     # Gemini API (Replacing Anthropic)
-    GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-    GEMINI_MODEL = 'gemini-1.5-flash'  # Fast, efficient, and has a great free tier
-    
+    GEMINI_API_KEY: Optional[str]
+    GEMINI_EMBEDDING_MODEL: str
+
     # Google Sheets
+    GOOGLE_CREDENTIALS_PATH: str
+    PILOT_ROSTER_SHEET_ID: Optional[str]
+    DRONE_FLEET_SHEET_ID: Optional[str]
+    MISSIONS_SHEET_ID: Optional[str]
+    SHEET_CACHE_TTL: float
+    OPS_IO_WORKERS: int
+
+    # Flask
+    PORT: int
+    DEBUG: bool
+    LOG_LEVEL: str
+
+    GEMINI_MODEL: str = 'gemini-1.5-flash'  # Fast, efficient, and has a great free tier
+
+    # AI Model
+    CLAUDE_MODEL: str = 'claude-sonnet-4-20250514'
+    MAX_TOKENS: int = 4096
+
+    def validate(self):
+        """Fail fast when required settings are missing"""
+        required = ('GEMINI_API_KEY', 'PILOT_ROSTER_SHEET_ID',
+                    'DRONE_FLEET_SHEET_ID', 'MISSIONS_SHEET_ID')
+        missing = [name for name in required if not getattr(self, name)]
+        if missing:
+            raise ValueError(f"Missing required configuration: {', '.join(missing)}")
+
+def _google_credentials_path() -> str:
+    """Path to the service-account file, materialising GOOGLE_CREDENTIALS if set"""
     # Check if credentials are in environment variable (Railway)
     if os.getenv('GOOGLE_CREDENTIALS'):
         # Write to temp file
-        import tempfile
         creds = json.loads(os.getenv('GOOGLE_CREDENTIALS'))
         with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
             json.dump(creds, f)
-            GOOGLE_CREDENTIALS_PATH = f.name
-    else:
-        GOOGLE_CREDENTIALS_PATH = os.getenv('GOOGLE_CREDENTIALS_PATH', 'credentials/google-sheets.json')
-    
-    PILOT_ROSTER_SHEET_ID = os.getenv('PILOT_ROSTER_SHEET_ID')
-    DRONE_FLEET_SHEET_ID = os.getenv('DRONE_FLEET_SHEET_ID')
-    MISSIONS_SHEET_ID = os.getenv('MISSIONS_SHEET_ID')
-    
-    # Flask
-    PORT = int(os.getenv('PORT', 5000))
-    DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
-    
-    # AI Model
-    CLAUDE_MODEL = 'claude-sonnet-4-20250514'
-    MAX_TOKENS = 4096
\ No newline at end of file
+            return f.name
+    return os.getenv('GOOGLE_CREDENTIALS_PATH', 'credentials/google-sheets.json')
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Load .env once and freeze the process-wide configuration"""
+    load_dotenv()
+
+    debug = os.getenv('DEBUG', 'False').lower() == 'true'
+
+    return Config(
+        GEMINI_API_KEY=os.getenv('GEMINI_API_KEY'),
+        GEMINI_EMBEDDING_MODEL=os.getenv('GEMINI_EMBEDDING_MODEL', 'gemini-embedding-001'),
+        GOOGLE_CREDENTIALS_PATH=_google_credentials_path(),
+        PILOT_ROSTER_SHEET_ID=os.getenv('PILOT_ROSTER_SHEET_ID'),
+        DRONE_FLEET_SHEET_ID=os.getenv('DRONE_FLEET_SHEET_ID'),
+        MISSIONS_SHEET_ID=os.getenv('MISSIONS_SHEET_ID'),
+        SHEET_CACHE_TTL=float(os.getenv('SHEET_CACHE_TTL', 30)),
+        OPS_IO_WORKERS=int(os.getenv('OPS_IO_WORKERS', 16)),
+        PORT=int(os.getenv('PORT', 5000)),
+        DEBUG=debug,
+        # Quiet by default in production; DEBUG=true brings back the INFO trail
+        LOG_LEVEL=os.getenv('LOG_LEVEL', 'INFO' if debug else 'WARNING').upper()
+    )
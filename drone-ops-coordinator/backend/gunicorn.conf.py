@@ -0,0 +1,13 @@
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Chat requests are IO-bound (Gemini + Sheets), so threads carry the concurrency.
+# Conversations live in process memory: keep one worker unless the proxy
+# routes each session to the same worker.
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', 1))
+threads = int(os.getenv('GUNICORN_THREADS', 16))
+
+# A chat turn can span several Gemini round-trips
+timeout = 120
@@ -1,138 +1,79 @@
 import json
 import logging
-from typing import List, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+from concurrent.futures import wait as futures_wait
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+import httpx
+import numpy as np
+import orjson
 from google import genai
 from google.genai import types
-from config import Config
+from config import get_config
+from services.response_cache import ResponseCache
+from services.sheets_service import IO_POOL
+from services.tool_limiter import ToolLimiter, WriteFence
 
 logger = logging.getLogger(__name__)
 
-class AgentService:
-    """AI Agent service using Gemini for conversational interface"""
-    
-    def __init__(self, sheets_service, assignment_service, conflict_service):
-        self.client = genai.Client(api_key=Config.GEMINI_API_KEY)
-        self.sheets = sheets_service
-        self.assignment = assignment_service
-        self.conflict = conflict_service
-        self.chat_session = None
-        self.model_id = "gemini-2.5-flash-lite"
-        
-        # Define available tools/functions for Gemini
-        # Note: Gemini uses OpenAPI-style schema. Your Anthropic 'input_schema'
-        # maps directly to Gemini's 'parameters'.
-        self.tools = [
-            types.Tool(
-                function_declarations=[
-                    types.FunctionDeclaration(
-                        name="get_pilot_roster",
-                        description="Get all pilots or filter by criteria (skill, certification, location, status)",
-                        parameters={
-                            "type": "OBJECT",
-                            "properties": {
-                                "skill": {"type": "STRING", "description": "Filter by skill (e.g., Mapping, Inspection)"},
-                                "certification": {"type": "STRING", "description": "Filter by certification (e.g., DGCA)"},
-                                "location": {"type": "STRING", "description": "Filter by location (e.g., Bangalore, Mumbai)"},
-                                "status": {"type": "STRING", "description": "Filter by status (Available, Assigned, On Leave)"}
-                            }
-                        }
-                    ),
-                    types.FunctionDeclaration(
-                        name="get_drone_fleet",
-                        description="Get all drones or filter by criteria (capability, status, location)",
-                        parameters={
-                            "type": "OBJECT",
-                            "properties": {
-                                "capability": {"type": "STRING", "description": "Filter by capability (e.g., Thermal, LiDAR)"},
-                                "status": {"type": "STRING", "description": "Filter by status (Available, Maintenance, Deployed)"},
-                                "location": {"type": "STRING", "description": "Filter by location"}
-                            }
-                        }
-                    ),
-                    types.FunctionDeclaration(
-                        name="get_missions",
-                        description="Get all missions or filter by criteria",
-                        parameters={
-                            "type": "OBJECT",
-                            "properties": {
-                                "priority": {"type": "STRING", "description": "Filter by priority (Urgent, High, Standard)"},
-                                "location": {"type": "STRING", "description": "Filter by location"}
-                            }
-                        }
-                    ),
-                    types.FunctionDeclaration(
-                        name="find_pilots_for_mission",
-                        description="Find suitable pilots for a specific mission/project",
-                        parameters={
-                            "type": "OBJECT",
-                            "properties": {
-                                "project_id": {"type": "STRING", "description": "Project ID (e.g., PRJ001)"}
-                            },
-                            "required": ["project_id"]
-                        }
-                    ),
-                    types.FunctionDeclaration(
-                        name="find_drones_for_mission",
-                        description="Find suitable drones for a specific mission/project",
-                        parameters={
-                            "type": "OBJECT",
-                            "properties": {
-                                "project_id": {"type": "STRING", "description": "Project ID"}
-                            },
-                            "required": ["project_id"]
-                        }
-                    ),
-                    types.FunctionDeclaration(
-                        name="detect_conflicts",
-                        description="Detect all conflicts (double-bookings, skill mismatches, location issues, maintenance)",
-                        parameters={"type": "OBJECT", "properties": {}}
-                    ),
-                    types.FunctionDeclaration(
-                        name="update_pilot_status",
-                        description="Update a pilot's status in Google Sheets",
-                        parameters={
-                            "type": "OBJECT",
-                            "properties": {
-                                "pilot_id": {"type": "STRING", "description": "Pilot ID (e.g., P001)"},
-                                "new_status": {"type": "STRING", "description": "New status (Available, Assigned, On Leave)"},
-                                "current_assignment": {"type": "STRING", "description": "Project ID if assigning"}
-                            },
-                            "required": ["pilot_id", "new_status"]
-                        }
-                    ),
-                    types.FunctionDeclaration(
-                        name="update_drone_status",
-                        description="Update a drone's status in Google Sheets",
-                        parameters={
-                            "type": "OBJECT",
-                            "properties": {
-                                "drone_id": {"type": "STRING", "description": "Drone ID (e.g., D001)"},
-                                "new_status": {"type": "STRING", "description": "New status (Available, Maintenance, Deployed)"},
-                                "current_assignment": {"type": "STRING", "description": "Project ID if assigning"}
-                            },
-                            "required": ["drone_id", "new_status"]
-                        }
-                    ),
-                    types.FunctionDeclaration(
-                        name="get_urgent_reassignment_suggestions",
-                        description="Get suggestions for urgent mission reassignments",
-                        parameters={
-                            "type": "OBJECT",
-                            "properties": {
-                                "project_id": {"type": "STRING", "description": "Urgent project ID"}
-                            },
-                            "required": ["project_id"]
-                        }
-                    )
-                ]
-            )
-        ]
-        
-        self.reset_conversation()
+CFG = get_config()
+
+# Tools that mutate the sheets; turns using them are never served from cache
+WRITE_TOOLS = {"update_pilot_status", "update_drone_status"}
+
+# Sheets each read tool depends on, so a round can fetch them up front
+TOOL_SHEETS = {
+    "get_pilot_roster": ("pilots",),
+    "get_drone_fleet": ("drones",),
+    "get_missions": ("missions",),
+    "find_pilots_for_mission": ("missions", "pilots"),
+    "find_drones_for_mission": ("missions", "drones"),
+    "get_urgent_reassignment_suggestions": ("missions", "pilots")
+}
+
+# Status writes coalesced when repeated in one round: tool -> (sheet, id argument)
+BATCHED_WRITE_TOOLS = {
+    "update_pilot_status": ("pilots", "pilot_id"),
+    "update_drone_status": ("drones", "drone_id")
+}
 
-    def _create_system_prompt(self) -> str:
-        """System instructions for the Skylark Drones AI"""
-        return """You are a helpful AI assistant for Skylark Drones operations coordination. 
+# Conversation window: turns kept verbatim, and turns whose tool outputs are kept
+HISTORY_KEEP_TURNS = 8
+TOOL_RESULT_KEEP_TURNS = 2
+SUMMARY_PREFIX = "[Prior context summary]: "
+SUMMARY_INSTRUCTION = (
+    "Summarize the following conversation in <=200 tokens, "
+    "preserving project IDs and assignments:"
+)
+STALE_TOOL_RESULT = {"result": "[omitted: stale tool output, call the tool again if needed]"}
+
+# Connection pool for Gemini calls: keep TLS sessions alive across chat turns
+GEMINI_HTTP_OPTIONS = types.HttpOptions(
+    timeout=60_000,  # milliseconds
+    client_args={
+        "http2": True,
+        "limits": httpx.Limits(max_keepalive_connections=100, max_connections=200)
+    }
+)
+
+# Conversations are per session id; the least recently used are dropped beyond this
+DEFAULT_SESSION = "default"
+MAX_CONVERSATIONS = 500
+
+# Per-tool budgets: calls per minute and seconds before a result is given up on.
+# Sheets allows about 300 reads and 60 writes per minute per project, and each
+# status update is up to two cell writes
+TOOL_CALLS_PER_MIN = {"update_pilot_status": 30, "update_drone_status": 30}
+TOOL_TIMEOUTS = {"update_pilot_status": 30, "update_drone_status": 30}
+DEFAULT_TOOL_CALLS_PER_MIN = 120
+DEFAULT_TOOL_TIMEOUT = 20
+
+# System instructions for the Skylark Drones AI
+_SYSTEM_PROMPT = """You are a helpful AI assistant for Skylark Drones operations coordination. 
 
 Your role is to help manage:
 - Pilot roster and availability
@@ -148,113 +89,598 @@ You have access to real-time data and can update pilot/drone statuses.
 4. Update statuses only when explicitly requested.
 Be professional and friendly."""
 
-    def chat(self, user_message: str) -> str:
-        """Process user message using Gemini's continuous chat session"""
+# Tool/function declarations for Gemini, built once per process
+# Note: Gemini uses OpenAPI-style schema. Your Anthropic 'input_schema'
+# maps directly to Gemini's 'parameters'.
+_TOOLS = [
+    types.Tool(
+        function_declarations=[
+            types.FunctionDeclaration(
+                name="get_pilot_roster",
+                description="Get all pilots or filter by criteria (skill, certification, location, status)",
+                parameters={
+                    "type": "OBJECT",
+                    "properties": {
+                        "skill": {"type": "STRING", "description": "Filter by skill (e.g., Mapping, Inspection)"},
+                        "certification": {"type": "STRING", "description": "Filter by certification (e.g., DGCA)"},
+                        "location": {"type": "STRING", "description": "Filter by location (e.g., Bangalore, Mumbai)"},
+                        "status": {"type": "STRING", "description": "Filter by status (Available, Assigned, On Leave)"}
+                    }
+                }
+            ),
+            types.FunctionDeclaration(
+                name="get_drone_fleet",
+                description="Get all drones or filter by criteria (capability, status, location)",
+                parameters={
+                    "type": "OBJECT",
+                    "properties": {
+                        "capability": {"type": "STRING", "description": "Filter by capability (e.g., Thermal, LiDAR)"},
+                        "status": {"type": "STRING", "description": "Filter by status (Available, Maintenance, Deployed)"},
+                        "location": {"type": "STRING", "description": "Filter by location"}
+                    }
+                }
+            ),
+            types.FunctionDeclaration(
+                name="get_missions",
+                description="Get all missions or filter by criteria",
+                parameters={
+                    "type": "OBJECT",
+                    "properties": {
+                        "priority": {"type": "STRING", "description": "Filter by priority (Urgent, High, Standard)"},
+                        "location": {"type": "STRING", "description": "Filter by location"}
+                    }
+                }
+            ),
+            types.FunctionDeclaration(
+                name="find_pilots_for_mission",
+                description="Find suitable pilots for a specific mission/project",
+                parameters={
+                    "type": "OBJECT",
+                    "properties": {
+                        "project_id": {"type": "STRING", "description": "Project ID (e.g., PRJ001)"}
+                    },
+                    "required": ["project_id"]
+                }
+            ),
+            types.FunctionDeclaration(
+                name="find_drones_for_mission",
+                description="Find suitable drones for a specific mission/project",
+                parameters={
+                    "type": "OBJECT",
+                    "properties": {
+                        "project_id": {"type": "STRING", "description": "Project ID"}
+                    },
+                    "required": ["project_id"]
+                }
+            ),
+            types.FunctionDeclaration(
+                name="detect_conflicts",
+                description="Detect all conflicts (double-bookings, skill mismatches, location issues, maintenance)",
+                parameters={"type": "OBJECT", "properties": {}}
+            ),
+            types.FunctionDeclaration(
+                name="update_pilot_status",
+                description="Update a pilot's status in Google Sheets",
+                parameters={
+                    "type": "OBJECT",
+                    "properties": {
+                        "pilot_id": {"type": "STRING", "description": "Pilot ID (e.g., P001)"},
+                        "new_status": {"type": "STRING", "description": "New status (Available, Assigned, On Leave)"},
+                        "current_assignment": {"type": "STRING", "description": "Project ID if assigning"}
+                    },
+                    "required": ["pilot_id", "new_status"]
+                }
+            ),
+            types.FunctionDeclaration(
+                name="update_drone_status",
+                description="Update a drone's status in Google Sheets",
+                parameters={
+                    "type": "OBJECT",
+                    "properties": {
+                        "drone_id": {"type": "STRING", "description": "Drone ID (e.g., D001)"},
+                        "new_status": {"type": "STRING", "description": "New status (Available, Maintenance, Deployed)"},
+                        "current_assignment": {"type": "STRING", "description": "Project ID if assigning"}
+                    },
+                    "required": ["drone_id", "new_status"]
+                }
+            ),
+            types.FunctionDeclaration(
+                name="get_urgent_reassignment_suggestions",
+                description="Get suggestions for urgent mission reassignments",
+                parameters={
+                    "type": "OBJECT",
+                    "properties": {
+                        "project_id": {"type": "STRING", "description": "Urgent project ID"}
+                    },
+                    "required": ["project_id"]
+                }
+            )
+        ]
+    )
+]
+
+# Generation settings are constant, so every chat session shares one config object
+_CHAT_CONFIG = types.GenerateContentConfig(
+    system_instruction=_SYSTEM_PROMPT,
+    tools=_TOOLS,
+    temperature=0.1 # Low temperature for operational accuracy
+)
+
+_SUMMARY_CONFIG = types.GenerateContentConfig(
+    system_instruction=SUMMARY_INSTRUCTION,
+    max_output_tokens=256,
+    temperature=0.1
+)
+
+@lru_cache(maxsize=1)
+def _get_genai_client() -> genai.Client:
+    """Process-wide Gemini client, so every agent shares one connection pool"""
+    return genai.Client(api_key=CFG.GEMINI_API_KEY, http_options=GEMINI_HTTP_OPTIONS)
+
+@dataclass(frozen=True)
+class PreEncoded:
+    """Tool result that is already serialised to JSON"""
+    json_str: str
+
+def _encode_result(result: Any) -> str:
+    """JSON for a tool result; pre-encoded frames pass straight through"""
+    if isinstance(result, PreEncoded):
+        return result.json_str
+    return orjson.dumps(result, default=str, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+class Conversation:
+    """One client's Gemini chat session and its rolling summary"""
+    
+    def __init__(self, chat_session):
+        self.chat_session = chat_session
+        self.summary = None
+        # Serialises turns within a session; different sessions run in parallel
+        self.lock = threading.Lock()
+
+class AgentService:
+    """AI Agent service using Gemini for conversational interface"""
+    
+    tools = _TOOLS
+    
+    def __init__(self, sheets_service, assignment_service, conflict_service):
+        self.client = _get_genai_client()
+        self.sheets = sheets_service
+        self.assignment = assignment_service
+        self.conflict = conflict_service
+        self.model_id = "gemini-2.5-flash-lite"
+        self.response_cache = ResponseCache(sheets_service, self._embed)
+        self._conversations = OrderedDict()
+        self._conversations_lock = threading.Lock()
+        # Tool calls and sheet prefetches share the process-wide Sheets I/O pool
+        self._pool = IO_POOL
+        self.limiter = ToolLimiter(TOOL_CALLS_PER_MIN, TOOL_TIMEOUTS,
+                                   DEFAULT_TOOL_CALLS_PER_MIN, DEFAULT_TOOL_TIMEOUT)
+        
+        # Tool name -> bound handler, resolved with one dict lookup per call;
+        # derived from the declarations so a tool without a handler fails at startup
+        self._dispatch = {
+            declaration.name: getattr(self, f"_tool_{declaration.name}")
+            for tool in _TOOLS
+            for declaration in tool.function_declarations
+        }
+
+    def chat(self, user_message: str, session_id: str = DEFAULT_SESSION) -> str:
+        """Process user message using the session's continuous Gemini chat"""
+        conversation = self._conversation(session_id)
+        with conversation.lock:
+            return self._chat(conversation, user_message)
+
+    def chat_stream(self, user_message: str, session_id: str = DEFAULT_SESSION) -> Iterator[str]:
+        """Like chat(), but yields the reply text as Gemini produces it"""
+        conversation = self._conversation(session_id)
+        with conversation.lock:
+            yield from self._chat_stream(conversation, user_message)
+
+    def _chat(self, conversation: Conversation, user_message: str) -> str:
         try:
+            cache_key, cached = self._cached_reply(conversation, user_message)
+            if cached is not None:
+                return cached
+            
             # Send message to Gemini chat session
-            response = self.chat_session.send_message(user_message)
+            response = conversation.chat_session.send_message(user_message)
+            wrote_sheets = False
             
             # Handle potential multi-turn tool calling
             # Gemini automatically suggests calls; we execute and send results back
-            while response.candidates[0].content.parts[0].function_call:
-                tool_results = []
-                
-                for part in response.candidates[0].content.parts:
-                    if part.function_call:
-                        call = part.function_call
-                        logger.info(f"Executing tool: {call.name} with input: {call.args}")
-                        
-                        result = self._execute_tool(call.name, call.args)
-                        
-                        tool_results.append(
-                            types.Part.from_function_response(
-                                name=call.name,
-                                response={"result": result}
-                            )
-                        )
+            calls = self._function_calls(response)
+            while calls:
+                wrote_sheets = wrote_sheets or any(call.name in WRITE_TOOLS for call in calls)
                 
                 # Send tool outputs back to the model to get the final natural language response
-                response = self.chat_session.send_message(tool_results)
+                response = conversation.chat_session.send_message(self._tool_responses(calls))
+                calls = self._function_calls(response)
 
+            self._finish_turn(conversation, cache_key, wrote_sheets, response.text)
             return response.text
             
         except Exception as e:
-            logger.error(f"Error in chat: {str(e)}")
+            logger.error("Error in chat: %s", e)
             return f"I encountered an error: {str(e)}. Please try again."
 
-    def _execute_tool(self, tool_name: str, tool_input: Dict) -> Any:
-        """Internal router for executing local service logic"""
+    def _chat_stream(self, conversation: Conversation, user_message: str) -> Iterator[str]:
         try:
-            if tool_name == "get_pilot_roster":
-                df = self.sheets.get_pilot_roster()
-                if tool_input.get('skill'):
-                    df = df[df['skills'].str.contains(tool_input['skill'], case=False, na=False)]
-                if tool_input.get('certification'):
-                    df = df[df['certifications'].str.contains(tool_input['certification'], case=False, na=False)]
-                if tool_input.get('location'):
-                    df = df[df['location'].str.contains(tool_input['location'], case=False, na=False)]
-                if tool_input.get('status'):
-                    df = df[df['status'] == tool_input['status']]
-                return df.to_dict(orient='records')
-
-            elif tool_name == "get_drone_fleet":
-                df = self.sheets.get_drone_fleet()
-                if tool_input.get('capability'):
-                    df = df[df['capabilities'].str.contains(tool_input['capability'], case=False, na=False)]
-                if tool_input.get('status'):
-                    df = df[df['status'] == tool_input['status']]
-                if tool_input.get('location'):
-                    df = df[df['location'].str.contains(tool_input['location'], case=False, na=False)]
-                return df.to_dict(orient='records')
-
-            elif tool_name == "get_missions":
-                df = self.sheets.get_missions()
-                if tool_input.get('priority'):
-                    df = df[df['priority'] == tool_input['priority']]
-                if tool_input.get('location'):
-                    df = df[df['location'].str.contains(tool_input['location'], case=False, na=False)]
-                return df.to_dict(orient='records')
-
-            elif tool_name == "find_pilots_for_mission":
-                return self.assignment.find_suitable_pilots(tool_input['project_id'])
-
-            elif tool_name == "find_drones_for_mission":
-                return self.assignment.find_suitable_drones(tool_input['project_id'])
-
-            elif tool_name == "detect_conflicts":
-                return self.conflict.detect_all_conflicts()
-
-            elif tool_name == "update_pilot_status":
-                return self.sheets.update_pilot_status(
-                    tool_input['pilot_id'], 
-                    tool_input['new_status'], 
-                    tool_input.get('current_assignment')
-                )
-
-            elif tool_name == "update_drone_status":
-                return self.sheets.update_drone_status(
-                    tool_input['drone_id'], 
-                    tool_input['new_status'], 
-                    tool_input.get('current_assignment')
-                )
-
-            elif tool_name == "get_urgent_reassignment_suggestions":
-                return self.assignment.get_reassignment_suggestions(tool_input['project_id'])
+            cache_key, cached = self._cached_reply(conversation, user_message)
+            if cached is not None:
+                yield cached
+                return
+            
+            message = user_message
+            wrote_sheets = False
+            text = []
+            
+            # Stream each round; rounds that end in function calls get their
+            # tool outputs sent back as the next streamed message
+            while True:
+                calls = []
+                for chunk in conversation.chat_session.send_message_stream(message):
+                    for part in self._parts(chunk):
+                        if part.function_call:
+                            calls.append(part.function_call)
+                        elif part.text:
+                            text.append(part.text)
+                            yield part.text
+                
+                if not calls:
+                    break
+                
+                wrote_sheets = wrote_sheets or any(call.name in WRITE_TOOLS for call in calls)
+                message = self._tool_responses(calls)
 
-            return {"error": f"Unknown tool: {tool_name}"}
+            self._finish_turn(conversation, cache_key, wrote_sheets, "".join(text))
+            
+        except Exception as e:
+            logger.error("Error in chat stream: %s", e)
+            yield f"I encountered an error: {str(e)}. Please try again."
 
+    def _prefetch_sheets(self, names: Iterable[str]) -> List[Future]:
+        """Start loading whichever of the named sheets are stale"""
+        # Tool calls that arrive mid-fetch wait on the sheet's cache lock rather
+        # than issuing a second request
+        readers = {
+            'pilots': self.sheets.get_pilot_roster,
+            'drones': self.sheets.get_drone_fleet,
+            'missions': self.sheets.get_missions
+        }
+        return [
+            self._pool.submit(self._warm_sheet, name, readers[name])
+            for name in names
+            if not self.sheets.is_fresh(name)
+        ]
+
+    def _load_sheets_for(self, calls: List):
+        """Plan a round: fetch every sheet its calls read exactly once, in parallel"""
+        needed = {name for call in calls for name in TOOL_SHEETS.get(call.name, ())}
+        futures = self._prefetch_sheets(sorted(needed))
+        # A single stale sheet gains nothing from a hop; the tool fetches it itself
+        if len(futures) > 1:
+            futures_wait(futures, timeout=DEFAULT_TOOL_TIMEOUT)
+
+    @staticmethod
+    def _warm_sheet(name: str, read):
+        try:
+            read()
         except Exception as e:
-            logger.error(f"Error executing tool {tool_name}: {str(e)}")
+            logger.warning("Prefetch of %s failed: %s", name, e)
+
+    def _cached_reply(self, conversation: Conversation,
+                      user_message: str) -> Tuple[Optional[Tuple[np.ndarray, str]], Optional[str]]:
+        """Cache key for an opening question, and the cached reply if there is one"""
+        # Only opening questions are cached; later turns depend on the conversation so far
+        if conversation.chat_session.get_history():
+            return None, None
+        
+        cache_key = self._response_cache_key(user_message)
+        cached = self.response_cache.lookup(*cache_key) if cache_key else None
+        if cached is not None:
+            conversation.chat_session = self._create_chat_session(history=[
+                types.Content(role="user", parts=[types.Part.from_text(text=user_message)]),
+                types.Content(role="model", parts=[types.Part.from_text(text=cached)])
+            ])
+        return cache_key, cached
+
+    def _tool_responses(self, calls: List) -> List[types.Part]:
+        """Execute a round's function calls and wrap their results for Gemini"""
+        # Independent calls in the same turn run concurrently
+        results = self._execute_tools(calls)
+        
+        return [
+            types.Part.from_function_response(
+                name=call.name,
+                response={"result": _encode_result(result)}
+            )
+            for call, result in zip(calls, results)
+        ]
+
+    def _finish_turn(self, conversation: Conversation, cache_key, wrote_sheets: bool, text: str):
+        """Update the response cache and schedule history compaction once a reply is complete"""
+        if not wrote_sheets and cache_key and text:
+            self.response_cache.store(*cache_key, text)
+
+        # Summarising is a Gemini call of its own; it runs once this turn releases the
+        # conversation, so neither the reply nor the stream's done frame waits for it
+        self._pool.submit(self._compact_history_when_idle, conversation)
+
+    def _compact_history_when_idle(self, conversation: Conversation):
+        """Compact a conversation's history once no turn holds it"""
+        with conversation.lock:
+            try:
+                self._compact_history(conversation)
+            except Exception as e:
+                # The reply is already complete; keep the full history this turn
+                logger.warning("History compaction failed: %s", e)
+
+    @staticmethod
+    def _parts(response) -> List[types.Part]:
+        """Content parts of a (possibly partial) response"""
+        if not response.candidates or not response.candidates[0].content:
+            return []
+        return response.candidates[0].content.parts or []
+
+    @classmethod
+    def _function_calls(cls, response) -> List[types.FunctionCall]:
+        """Every function call in a response, in one pass over its parts"""
+        return [part.function_call for part in cls._parts(response) if part.function_call]
+
+    def _compact_history(self, conversation: Conversation):
+        """Bound the prompt: summarise old turns and drop stale tool outputs"""
+        history = conversation.chat_session.get_history(curated=True)
+        turn_starts = [i for i, content in enumerate(history) if self._is_user_turn(content)]
+        changed = False
+        
+        if len(turn_starts) > 2 * HISTORY_KEEP_TURNS:
+            cut = turn_starts[-HISTORY_KEEP_TURNS]
+            conversation.summary = self._summarize(history[:cut])
+            history = [
+                types.Content(role="user", parts=[types.Part.from_text(text=SUMMARY_PREFIX + conversation.summary)]),
+                types.Content(role="model", parts=[types.Part.from_text(text="Understood.")])
+            ] + history[cut:]
+            turn_starts = [i for i, content in enumerate(history) if self._is_user_turn(content)]
+            changed = True
+        
+        # Tool outputs from older turns can be re-fetched from the sheets
+        if len(turn_starts) > TOOL_RESULT_KEEP_TURNS:
+            for i in range(turn_starts[-TOOL_RESULT_KEEP_TURNS]):
+                parts = history[i].parts or []
+                if any(p.function_response and p.function_response.response != STALE_TOOL_RESULT for p in parts):
+                    history[i] = types.Content(role=history[i].role, parts=[
+                        types.Part.from_function_response(name=p.function_response.name, response=STALE_TOOL_RESULT)
+                        if p.function_response else p
+                        for p in parts
+                    ])
+                    changed = True
+        
+        if changed:
+            conversation.chat_session = self._create_chat_session(history=history)
+
+    def _summarize(self, contents: List[types.Content]) -> str:
+        """Condense earlier turns (including any previous summary) into a short note"""
+        lines = []
+        for content in contents:
+            for part in content.parts or []:
+                if part.text:
+                    lines.append(f"{content.role}: {part.text}")
+                elif part.function_call:
+                    lines.append(f"{content.role}: [called {part.function_call.name} with {part.function_call.args}]")
+        
+        response = self.client.models.generate_content(
+            model=self.model_id,
+            contents="\n".join(lines),
+            config=_SUMMARY_CONFIG
+        )
+        return response.text or ""
+
+    @staticmethod
+    def _is_user_turn(content: types.Content) -> bool:
+        """A user-authored message, as opposed to a function response or the summary"""
+        texts = [part.text for part in content.parts or [] if part.text]
+        return content.role == "user" and bool(texts) and not texts[0].startswith(SUMMARY_PREFIX)
+
+    def _embed(self, text: str) -> List[float]:
+        """Embed text with Gemini's embedding model"""
+        result = self.client.models.embed_content(
+            model=CFG.GEMINI_EMBEDDING_MODEL,
+            contents=text
+        )
+        return result.embeddings[0].values
+
+    def _response_cache_key(self, user_message: str) -> Optional[Tuple[np.ndarray, str]]:
+        """Embedding and sheet fingerprint for a message, or None if unavailable"""
+        try:
+            # The fingerprint comes from frames in memory; without one there's nothing
+            # to match against, so the embedding call is skipped too
+            state_hash = self.response_cache.sheets_state_hash()
+            if state_hash is None:
+                return None
+            return self.response_cache.embed(user_message), state_hash
+        except Exception as e:
+            # The cache is an optimisation; fall through to a live answer
+            logger.warning("Response cache unavailable: %s", e)
+            return None
+
+    def _execute_tools(self, calls: List) -> List[Any]:
+        """Run a turn's function calls concurrently, preserving call order"""
+        # Skip walking the calls (and their argument reprs) unless someone is listening
+        if logger.isEnabledFor(logging.INFO):
+            for call in calls:
+                logger.info("Executing tool: %s with input: %s", call.name, call.args)
+        
+        # Sheets shared by several calls (e.g. get_pilot_roster + find_pilots_for_mission)
+        # are read once, and a tool's own sheets arrive in parallel rather than in turn
+        self._load_sheets_for(calls)
+        
+        # Repeated status writes to one sheet become a single batch request
+        groups = {}
+        for i, call in enumerate(calls):
+            key = call.name if call.name in BATCHED_WRITE_TOOLS else i
+            groups.setdefault(key, []).append(i)
+        
+        jobs = []
+        for key, indices in groups.items():
+            # Writes are fenced, so one reported as timed out can never land afterwards
+            fence = WriteFence() if calls[indices[0]].name in WRITE_TOOLS else None
+            if len(indices) > 1:
+                inputs = [calls[i].args or {} for i in indices]
+                jobs.append((indices, key, fence, self._batch_update_statuses, (key, inputs, fence)))
+            else:
+                call = calls[indices[0]]
+                jobs.append((indices, call.name, fence, self._execute_tool_as_list,
+                             (call.name, call.args or {}, fence)))
+        
+        # A read in the same round as a write would race it, seeing the write or not
+        # depending on timing; such rounds run their writes first, then the reads
+        writes = [job for job in jobs if job[2] is not None]
+        reads = [job for job in jobs if job[2] is None]
+        
+        results = [None] * len(calls)
+        for phase in ((writes, reads) if writes and reads else (jobs,)):
+            self._run_jobs(phase, results)
+        return results
+
+    def _run_jobs(self, jobs: List[Tuple], results: List[Any]):
+        """Run jobs side by side, filling each one's slots in results"""
+        # The phase costs max(latencies), not their sum. A read that outlives its tool's
+        # timeout is reported as such (and cancelled if it never started); a write is only
+        # reported as timed out if it had not begun writing, otherwise its real outcome
+        # is waited for
+        started = time.monotonic()
+        futures = [self._pool.submit(run, *args) for _, _, _, run, args in jobs]
+        
+        for (indices, tool_name, fence, _, _), future in zip(jobs, futures):
+            remaining = started + self.limiter.timeout(tool_name) - time.monotonic()
+            try:
+                output = future.result(timeout=max(remaining, 0))
+            except FuturesTimeoutError:
+                future.cancel()
+                if fence is None or fence.abandon():
+                    logger.warning("Tool %s timed out", tool_name)
+                    output = [{"error": "timeout"}] * len(indices)
+                else:
+                    output = future.result()
+            for i, result in zip(indices, output):
+                results[i] = result
+
+    def _execute_tool_as_list(self, tool_name: str, tool_input: Dict,
+                              fence: Optional[WriteFence] = None) -> List[Any]:
+        return [self._execute_tool(tool_name, tool_input, fence)]
+
+    def _batch_update_statuses(self, tool_name: str, tool_inputs: List[Dict],
+                               fence: Optional[WriteFence] = None) -> List[Any]:
+        """Run one round's calls of a status-update tool as a single sheet write"""
+        sheet, id_key = BATCHED_WRITE_TOOLS[tool_name]
+        if not self.limiter.acquire(tool_name):
+            return [{"error": f"Rate limit reached for {tool_name}, try again shortly"}] * len(tool_inputs)
+        if fence is not None and not fence.begin():
+            return [{"error": "timeout"}] * len(tool_inputs)
+        
+        try:
+            return self.sheets.batch_update_statuses(sheet, [
+                {
+                    "id": tool_input[id_key],
+                    "new_status": tool_input['new_status'],
+                    "current_assignment": tool_input.get('current_assignment')
+                }
+                for tool_input in tool_inputs
+            ])
+        except Exception as e:
+            logger.error("Error executing tool %s: %s", tool_name, e)
+            return [{"error": str(e)}] * len(tool_inputs)
+
+    def _execute_tool(self, tool_name: str, tool_input: Dict,
+                      fence: Optional[WriteFence] = None) -> Any:
+        """Internal router for executing local service logic"""
+        handler = self._dispatch.get(tool_name)
+        if handler is None:
+            return {"error": f"Unknown tool: {tool_name}"}
+        if not self.limiter.acquire(tool_name):
+            return {"error": f"Rate limit reached for {tool_name}, try again shortly"}
+        if fence is not None and not fence.begin():
+            # The round already reported this write as timed out
+            return {"error": "timeout"}
+        
+        try:
+            return handler(tool_input)
+        except Exception as e:
+            logger.error("Error executing tool %s: %s", tool_name, e)
             return {"error": str(e)}
 
-    def reset_conversation(self):
-        """Reset state by starting a fresh Gemini chat session"""
-        self.chat_session = self.client.chats.create(
+    def _tool_get_pilot_roster(self, tool_input: Dict) -> PreEncoded:
+        df = self.sheets.filter_pilots(
+            skill=tool_input.get('skill'),
+            certification=tool_input.get('certification'),
+            location=tool_input.get('location'),
+            status=tool_input.get('status')
+        )
+        return PreEncoded(self.sheets.get_sheet_json('pilots', df))
+
+    def _tool_get_drone_fleet(self, tool_input: Dict) -> PreEncoded:
+        df = self.sheets.filter_drones(
+            capability=tool_input.get('capability'),
+            status=tool_input.get('status'),
+            location=tool_input.get('location')
+        )
+        return PreEncoded(self.sheets.get_sheet_json('drones', df))
+
+    def _tool_get_missions(self, tool_input: Dict) -> PreEncoded:
+        df = self.sheets.filter_missions(
+            priority=tool_input.get('priority'),
+            location=tool_input.get('location')
+        )
+        return PreEncoded(self.sheets.get_sheet_json('missions', df))
+
+    def _tool_find_pilots_for_mission(self, tool_input: Dict) -> List[Dict]:
+        return self.assignment.find_suitable_pilots(tool_input['project_id'])
+
+    def _tool_find_drones_for_mission(self, tool_input: Dict) -> List[Dict]:
+        return self.assignment.find_suitable_drones(tool_input['project_id'])
+
+    def _tool_detect_conflicts(self, tool_input: Dict) -> Dict[str, List[Dict]]:
+        return self.conflict.get_conflicts()
+
+    def _tool_update_pilot_status(self, tool_input: Dict) -> Dict:
+        return self.sheets.update_pilot_status(
+            tool_input['pilot_id'], 
+            tool_input['new_status'], 
+            tool_input.get('current_assignment')
+        )
+
+    def _tool_update_drone_status(self, tool_input: Dict) -> Dict:
+        return self.sheets.update_drone_status(
+            tool_input['drone_id'], 
+            tool_input['new_status'], 
+            tool_input.get('current_assignment')
+        )
+
+    def _tool_get_urgent_reassignment_suggestions(self, tool_input: Dict) -> Dict:
+        return self.assignment.get_reassignment_suggestions(tool_input['project_id'])
+
+    def _conversation(self, session_id: str) -> Conversation:
+        """Get or start the conversation for a session, evicting the least recently used"""
+        with self._conversations_lock:
+            conversation = self._conversations.get(session_id)
+            if conversation is None:
+                conversation = Conversation(self._create_chat_session())
+                self._conversations[session_id] = conversation
+                if len(self._conversations) > MAX_CONVERSATIONS:
+                    self._conversations.popitem(last=False)
+            self._conversations.move_to_end(session_id)
+            return conversation
+
+    def _create_chat_session(self, history: Optional[List[types.Content]] = None):
+        """Start a Gemini chat session, optionally seeded with history"""
+        return self.client.chats.create(
             model=self.model_id,
-            config=types.GenerateContentConfig(
-                system_instruction=self._create_system_prompt(),
-                tools=self.tools,
-                temperature=0.1 # Low temperature for operational accuracy
-            )
+            history=history,
+            config=_CHAT_CONFIG
         )
-        logger.info("Chat session initialized/reset")
\ No newline at end of file
+
+    def reset_conversation(self, session_id: str = DEFAULT_SESSION):
+        """Reset state by starting a fresh Gemini chat session"""
+        with self._conversations_lock:
+            self._conversations.pop(session_id, None)
+        logger.info("Chat session reset")
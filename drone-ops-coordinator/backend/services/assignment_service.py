@@ -1,173 +1,224 @@
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Callable, Iterable, List, Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Matches returned per project; the agent only ever presents the best few
+MAX_MATCHES = 20
+
+# Memoised match results kept per (kind, project, sheet versions); oldest evicted first
+MATCH_CACHE_SIZE = 32
+
+def _bitmasks(sets: pd.Series, required: Iterable[str]) -> Tuple[np.ndarray, int]:
+    """Encode each row's token set, and the required tokens, as bits of one integer
+    
+    Subset tests then become (masks & required) == required over a whole column.
+    """
+    vocab = sorted(set(required).union(*sets))
+    bits = {token: 1 << i for i, token in enumerate(vocab)}
+    # uint64 covers any realistic skill vocabulary; wider ones fall back to Python ints
+    dtype = np.uint64 if len(bits) <= 64 else object
+    masks = np.array([sum(bits[token] for token in row) for row in sets], dtype=dtype)
+    required_mask = sum(bits[token] for token in set(required))
+    return masks, (np.uint64(required_mask) if dtype is np.uint64 else required_mask)
+
+def _popcount(masks: np.ndarray) -> np.ndarray:
+    """Number of set bits in each mask"""
+    if masks.dtype == np.uint64 and hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(masks).astype(np.int64)
+    # NumPy < 2.0, or vocabularies wider than 64 tokens
+    return np.fromiter((int(mask).bit_count() for mask in masks), dtype=np.int64, count=len(masks))
+
 class AssignmentService:
     """Service for matching pilots and drones to missions"""
     
     def __init__(self, sheets_service):
         self.sheets = sheets_service
+        self._matches = OrderedDict()
+        self._matches_lock = threading.Lock()
     
     def find_suitable_pilots(self, project_id: str) -> List[Dict]:
         """Find pilots suitable for a specific project"""
         try:
-            missions_df = self.sheets.get_missions()
-            pilots_df = self.sheets.get_pilot_roster()
-            
-            # Get project details
-            project = missions_df[missions_df['project_id'] == project_id]
-            
-            if len(project) == 0:
-                raise ValueError(f"Project {project_id} not found")
-            
-            project = project.iloc[0]
-            
-            required_skills = set(str(project['required_skills']).split(', '))
-            required_certs = set(str(project['required_certs']).split(', '))
-            location = project['location']
-            start_date = pd.to_datetime(project['start_date'])
-            
-            suitable_pilots = []
-            
-            for _, pilot in pilots_df.iterrows():
-                pilot_skills = set(str(pilot['skills']).split(', '))
-                pilot_certs = set(str(pilot['certifications']).split(', '))
-                
-                # Check skills
-                has_skills = required_skills.issubset(pilot_skills)
-                
-                # Check certifications
-                has_certs = required_certs.issubset(pilot_certs)
-                
-                # Check location
-                same_location = pilot['location'] == location
-                
-                # Check availability
-                is_available = pilot['status'] == 'Available'
-                
-                # Check available from date
-                available_from = pd.to_datetime(pilot['available_from'])
-                is_available_on_date = available_from <= start_date
-                
-                # Calculate suitability score
-                score = 0
-                if has_skills and has_certs:
-                    score += 50
-                    if is_available and is_available_on_date:
-                        score += 30
-                    if same_location:
-                        score += 20
-                    
-                    # Bonus for extra skills
-                    extra_skills = pilot_skills - required_skills
-                    score += len(extra_skills) * 2
-                    
-                    suitable_pilots.append({
-                        'pilot_id': pilot['pilot_id'],
-                        'name': pilot['name'],
-                        'location': pilot['location'],
-                        'status': pilot['status'],
-                        'skills': list(pilot_skills),
-                        'certifications': list(pilot_certs),
-                        'same_location': same_location,
-                        'is_available': is_available,
-                        'score': score,
-                        'recommendation': self._get_recommendation(
-                            has_skills, has_certs, is_available, same_location
-                        )
-                    })
-            
-            # Sort by score (highest first)
-            suitable_pilots.sort(key=lambda x: x['score'], reverse=True)
-            
-            logger.info(f"Found {len(suitable_pilots)} suitable pilots for {project_id}")
-            
-            return suitable_pilots
-            
+            return self._memoised(project_id, 'pilots', self.sheets.get_pilot_roster,
+                                  self._match_pilots)
         except Exception as e:
-            logger.error(f"Error finding suitable pilots: {str(e)}")
+            logger.error("Error finding suitable pilots: %s", e)
             raise
     
     def find_suitable_drones(self, project_id: str) -> List[Dict]:
         """Find drones suitable for a specific project"""
         try:
-            missions_df = self.sheets.get_missions()
-            drones_df = self.sheets.get_drone_fleet()
-            
-            # Get project details
-            project = missions_df[missions_df['project_id'] == project_id]
-            
-            if len(project) == 0:
-                raise ValueError(f"Project {project_id} not found")
-            
-            project = project.iloc[0]
-            location = project['location']
-            
-            # Infer required capabilities from skills
-            required_skills = str(project['required_skills']).lower()
-            required_capabilities = []
-            
-            if 'thermal' in required_skills:
-                required_capabilities.append('Thermal')
-            if 'mapping' in required_skills or 'lidar' in required_skills:
-                required_capabilities.append('LiDAR')
-            
-            suitable_drones = []
-            
-            for _, drone in drones_df.iterrows():
-                drone_caps = set(str(drone['capabilities']).split(', '))
-                
-                # Check availability
-                is_available = drone['status'] == 'Available'
-                
-                # Check location
-                same_location = drone['location'] == location
-                
-                # Check maintenance
-                needs_maintenance = drone['status'] == 'Maintenance'
-                
-                # Calculate score
-                score = 0
-                if is_available:
-                    score += 40
-                if same_location:
-                    score += 30
-                
-                # Check if has required capabilities
-                if required_capabilities:
-                    has_required = any(cap in drone_caps for cap in required_capabilities)
-                    if has_required:
-                        score += 30
-                else:
-                    score += 20  # No specific requirement
-                
-                if not needs_maintenance:
-                    suitable_drones.append({
-                        'drone_id': drone['drone_id'],
-                        'model': drone['model'],
-                        'capabilities': list(drone_caps),
-                        'location': drone['location'],
-                        'status': drone['status'],
-                        'same_location': same_location,
-                        'is_available': is_available,
-                        'maintenance_due': drone['maintenance_due'],
-                        'score': score
-                    })
-            
-            # Sort by score
-            suitable_drones.sort(key=lambda x: x['score'], reverse=True)
-            
-            logger.info(f"Found {len(suitable_drones)} suitable drones for {project_id}")
-            
-            return suitable_drones
-            
+            return self._memoised(project_id, 'drones', self.sheets.get_drone_fleet,
+                                  self._match_drones)
         except Exception as e:
-            logger.error(f"Error finding suitable drones: {str(e)}")
+            logger.error("Error finding suitable drones: %s", e)
             raise
     
+    def _memoised(self, project_id: str, sheet: str, read_sheet: Callable[[], pd.DataFrame],
+                  match: Callable[[str, pd.DataFrame, pd.DataFrame], List[Dict]]) -> List[Dict]:
+        """Serve a match computed from the same missions/candidate sheet versions, or compute it
+        
+        The returned list is shared between callers and must not be mutated.
+        """
+        before = (self.sheets.version('missions'), self.sheets.version(sheet))
+        missions_df = self.sheets.get_missions()
+        candidates_df = read_sheet()
+        after = (self.sheets.version('missions'), self.sheets.version(sheet))
+        
+        # Only memoise when no refetch landed mid-read, so the frames match the key
+        key = (sheet, project_id) + after
+        if before == after:
+            with self._matches_lock:
+                if key in self._matches:
+                    self._matches.move_to_end(key)
+                    return self._matches[key]
+        
+        result = match(project_id, missions_df, candidates_df)
+        
+        if before == after:
+            with self._matches_lock:
+                self._matches[key] = result
+                if len(self._matches) > MATCH_CACHE_SIZE:
+                    self._matches.popitem(last=False)
+        return result
+    
+    def _match_pilots(self, project_id: str, missions_df: pd.DataFrame,
+                      pilots_df: pd.DataFrame) -> List[Dict]:
+        """Score every pilot holding the project's skills and certifications"""
+        # Get project details
+        project = missions_df[missions_df['project_id'] == project_id]
+        
+        if len(project) == 0:
+            raise ValueError(f"Project {project_id} not found")
+        
+        project = project.iloc[0]
+        
+        required_skills = project['_required_skills_set']
+        required_certs = project['_required_certs_set']
+        location = project['location']
+        start_date = project['_start_ts']
+        
+        # Whole-column checks instead of boxing every row through iterrows
+        pilot_skills = pilots_df['_skills_set']
+        pilot_certs = pilots_df['_certs_set']
+        
+        skill_masks, skills_required = _bitmasks(pilot_skills, required_skills)
+        cert_masks, certs_required = _bitmasks(pilot_certs, required_certs)
+        
+        has_skills = ((skill_masks & skills_required) == skills_required).astype(bool)
+        has_certs = ((cert_masks & certs_required) == certs_required).astype(bool)
+        same_location = (pilots_df['location'] == location).to_numpy(dtype=bool)
+        is_available = (pilots_df['status'] == 'Available').to_numpy(dtype=bool)
+        is_available_on_date = (pilots_df['_available_from_ts'] <= start_date).to_numpy(dtype=bool)
+        
+        # Calculate suitability score as one column expression, plus a bonus for extra skills
+        qualified = has_skills & has_certs
+        extra_skills = _popcount(skill_masks & ~skills_required)
+        score = np.where(qualified, 50 + 30 * (is_available & is_available_on_date)
+                         + 20 * same_location + 2 * extra_skills, 0)
+        
+        # Sort by score (highest first), keeping sheet order among ties; only the
+        # top MAX_MATCHES are materialised as dicts
+        order = np.argsort(-score, kind='stable')
+        qualified = order[qualified[order]][:MAX_MATCHES]
+        
+        matches = pilots_df.iloc[qualified]
+        suitable_pilots = [
+            {
+                'pilot_id': pilot_id,
+                'name': name,
+                'location': pilot_location,
+                'status': status,
+                'skills': list(skills),
+                'certifications': list(certs),
+                'same_location': bool(same_location[i]),
+                'is_available': bool(is_available[i]),
+                'score': int(score[i]),
+                'recommendation': self._get_recommendation(
+                    True, True, bool(is_available[i]), bool(same_location[i])
+                )
+            }
+            for i, pilot_id, name, pilot_location, status, skills, certs in zip(
+                qualified, matches['pilot_id'], matches['name'], matches['location'],
+                matches['status'], pilot_skills.iloc[qualified], pilot_certs.iloc[qualified]
+            )
+        ]
+        
+        logger.info("Found %s suitable pilots for %s", len(suitable_pilots), project_id)
+        
+        return suitable_pilots
+    
+    def _match_drones(self, project_id: str, missions_df: pd.DataFrame,
+                      drones_df: pd.DataFrame) -> List[Dict]:
+        """Score every drone not in maintenance for the project"""
+        # Get project details
+        project = missions_df[missions_df['project_id'] == project_id]
+        
+        if len(project) == 0:
+            raise ValueError(f"Project {project_id} not found")
+        
+        project = project.iloc[0]
+        location = project['location']
+        
+        # Infer required capabilities from skills
+        required_skills = str(project['required_skills']).lower()
+        required_capabilities = []
+        
+        if 'thermal' in required_skills:
+            required_capabilities.append('Thermal')
+        if 'mapping' in required_skills or 'lidar' in required_skills:
+            required_capabilities.append('LiDAR')
+        
+        drone_caps = drones_df['_capabilities_set']
+        
+        is_available = (drones_df['status'] == 'Available').to_numpy(dtype=bool)
+        same_location = (drones_df['location'] == location).to_numpy(dtype=bool)
+        needs_maintenance = (drones_df['status'] == 'Maintenance').to_numpy(dtype=bool)
+        
+        # Calculate score
+        score = 40 * is_available + 30 * same_location
+        
+        # Check if has any of the required capabilities
+        if required_capabilities:
+            cap_masks, caps_required = _bitmasks(drone_caps, required_capabilities)
+            score = score + 30 * ((cap_masks & caps_required) != 0).astype(bool)
+        else:
+            score = score + 20  # No specific requirement
+        
+        candidates = np.flatnonzero(~needs_maintenance)
+        
+        # Sort by score, keeping sheet order among ties, and keep the top MAX_MATCHES
+        candidates = candidates[np.argsort(-score[candidates], kind='stable')][:MAX_MATCHES]
+        
+        matches = drones_df.iloc[candidates]
+        suitable_drones = [
+            {
+                'drone_id': drone_id,
+                'model': model,
+                'capabilities': list(caps),
+                'location': drone_location,
+                'status': status,
+                'same_location': bool(same_location[i]),
+                'is_available': bool(is_available[i]),
+                'maintenance_due': maintenance_due,
+                'score': int(score[i])
+            }
+            for i, drone_id, model, caps, drone_location, status, maintenance_due in zip(
+                candidates, matches['drone_id'], matches['model'], drone_caps.iloc[candidates],
+                matches['location'], matches['status'], matches['maintenance_due']
+            )
+        ]
+        
+        logger.info("Found %s suitable drones for %s", len(suitable_drones), project_id)
+        
+        return suitable_drones
+    
     def get_reassignment_suggestions(self, project_id: str) -> Dict:
         """Get suggestions for urgent reassignment"""
         try:
@@ -190,32 +241,23 @@ class AssignmentService:
             
             # If urgent and no immediate pilots available
             if priority == 'Urgent' and len(suggestions["immediate_available"]) == 0:
-                # Find pilots on lower priority missions
+                # Find pilots on lower priority missions: one join instead of a
+                # missions scan per assigned pilot (first mission row wins, as before)
                 assigned_pilots = pilots_df[pilots_df['current_assignment'] != '–']
+                current_missions = missions_df[['project_id', 'priority']].drop_duplicates('project_id').rename(
+                    columns={'project_id': 'current_assignment', 'priority': 'current_priority'}
+                )
+                candidates = assigned_pilots.merge(current_missions, on='current_assignment', how='inner')
+                candidates = candidates[candidates['current_priority'].isin(['Standard', 'Medium'])]
                 
-                for _, pilot in assigned_pilots.iterrows():
-                    current_mission = missions_df[
-                        missions_df['project_id'] == pilot['current_assignment']
-                    ]
-                    
-                    if len(current_mission) > 0:
-                        current_mission = current_mission.iloc[0]
-                        current_priority = current_mission['priority']
-                        
-                        # Only suggest if current mission is lower priority
-                        if current_priority in ['Standard', 'Medium']:
-                            suggestions["reassignment_candidates"].append({
-                                "pilot_id": pilot['pilot_id'],
-                                "name": pilot['name'],
-                                "current_assignment": pilot['current_assignment'],
-                                "current_priority": current_priority,
-                                "location": pilot['location']
-                            })
+                suggestions["reassignment_candidates"] = candidates[
+                    ['pilot_id', 'name', 'current_assignment', 'current_priority', 'location']
+                ].to_dict('records')
             
             return suggestions
             
         except Exception as e:
-            logger.error(f"Error getting reassignment suggestions: {str(e)}")
+            logger.error("Error getting reassignment suggestions: %s", e)
             raise
     
     def _get_recommendation(self, has_skills: bool, has_certs: bool, 
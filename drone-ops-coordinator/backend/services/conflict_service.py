@@ -1,246 +1,386 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
 from datetime import datetime
-from typing import List, Dict
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
 import pandas as pd
+import threading
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Seconds between background conflict scans
+CONFLICT_REFRESH_INTERVAL = 15
+
+# The four detectors run side by side once a scan's snapshot is built; kept apart
+# from the sheets I/O pool, since scans are also started from tool calls on it
+DETECTOR_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='conflict-scan')
+
+# Below this many rows across the three sheets, a scan runs its detectors in turn;
+# the pool hand-off would cost more than it saves
+PARALLEL_SCAN_MIN_ROWS = 500
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """Sheet frames (and the indexes derived from them) shared by one conflict scan
+    
+    Derived indexes are built on first use, inside whichever detector needs them, so a
+    sheet missing a column only empties the detectors that read it. Detectors running
+    side by side may both build one; that only costs the duplicate work.
+    """
+    missions: pd.DataFrame
+    pilots: pd.DataFrame
+    drones: pd.DataFrame
+    
+    @cached_property
+    def intervals(self) -> pd.IntervalIndex:
+        # Missions without a usable date range (blank, malformed or reversed) never overlap
+        start, end = self.missions['_start_ts'], self.missions['_end_ts']
+        valid = start <= end
+        return pd.IntervalIndex.from_arrays(start.where(valid), end.where(valid), closed='both')
+    
+    @cached_property
+    def mission_by_project(self) -> pd.DataFrame:
+        """First mission row per project id, which is the row every detector checks against"""
+        return self.missions.drop_duplicates('project_id')
+    
+    @cached_property
+    def assigned_pilots(self) -> pd.DataFrame:
+        """Pilots with a current assignment, in sheet order"""
+        return self.pilots[self.pilots['current_assignment'] != '–']
+    
+    @cached_property
+    def assigned_drones(self) -> pd.DataFrame:
+        """Drones with a current assignment, in sheet order"""
+        return self.drones[self.drones['current_assignment'] != '–']
+
+def _fingerprint(frames: Sequence[pd.DataFrame]) -> bytes:
+    """Content hash of the sheets' own columns (the '_' ones are derived from them)"""
+    digest = hashlib.md5()
+    for df in frames:
+        columns = [col for col in df.columns if not str(col).startswith('_')]
+        digest.update(repr(columns).encode())
+        digest.update(pd.util.hash_pandas_object(df[columns], index=False).values.tobytes())
+    return digest.digest()
+
+def _incidence(held: Sequence[frozenset], required: Sequence[frozenset]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Row x token boolean matrices for paired held/required token sets, and the token names
+    
+    A row is missing token j when required[i, j] & ~held[i, j], for every row at once.
+    """
+    vocab = sorted(set().union(*held, *required))
+    column = {token: j for j, token in enumerate(vocab)}
+    
+    def matrix(sets: Sequence[frozenset]) -> np.ndarray:
+        incidence = np.zeros((len(sets), len(vocab)), dtype=bool)
+        rows = [i for i, tokens in enumerate(sets) for _ in tokens]
+        cols = [column[token] for tokens in sets for token in tokens]
+        incidence[rows, cols] = True
+        return incidence
+    
+    return matrix(held), matrix(required), np.array(vocab, dtype=object)
+
 class ConflictService:
     """Service for detecting scheduling and assignment conflicts"""
     
     def __init__(self, sheets_service):
         self.sheets = sheets_service
+        
+        # Latest result of detect_all_conflicts, published by the background refresher
+        self._latest: Optional[Dict[str, List[Dict]]] = None
+        self._generation = 0  # bumped by writes so scans started earlier are discarded
+        self._latest_lock = threading.Lock()
+        self._refresh_requested = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+        
+        # (frames, content fingerprint, result) of the last full scan; detection is
+        # deterministic, so unchanged sheets reuse the result instead of rescanning
+        self._memo: Optional[Tuple[Tuple[pd.DataFrame, ...], bytes, Dict[str, List[Dict]]]] = None
+        
+        # Writes make the latest scan stale and wake the refresher
+        sheets_service.add_update_listener(self._on_sheet_update)
     
-    def detect_all_conflicts(self) -> Dict[str, List[Dict]]:
-        """Detect all types of conflicts"""
-        try:
-            conflicts = {
-                "double_bookings": self.detect_double_bookings(),
-                "skill_mismatches": self.detect_skill_mismatches(),
-                "location_mismatches": self.detect_location_mismatches(),
-                "maintenance_conflicts": self.detect_maintenance_conflicts()
-            }
-            
-            total_conflicts = sum(len(v) for v in conflicts.values())
-            logger.info(f"Detected {total_conflicts} total conflicts")
-            
-            return conflicts
+    def start_background_refresh(self, interval: float = CONFLICT_REFRESH_INTERVAL):
+        """Rescan conflicts every `interval` seconds (and after writes) on a daemon thread"""
+        if self._refresher is not None:
+            return
+        
+        self._refresher = threading.Thread(
+            target=self._refresh_loop, args=(interval,),
+            name='conflict-refresh', daemon=True
+        )
+        self._refresher.start()
+    
+    def get_conflicts(self) -> Dict[str, List[Dict]]:
+        """Latest conflict scan, scanning inline when none is current"""
+        with self._latest_lock:
+            latest, generation = self._latest, self._generation
+        
+        if latest is None or self._refresher is None:
+            latest = self.detect_all_conflicts()
+            self._publish(latest, generation)
+        return latest
+    
+    def _refresh_loop(self, interval: float):
+        while True:
+            try:
+                generation = self._generation
+                self._publish(self.detect_all_conflicts(), generation)
+            except Exception as e:
+                logger.error("Background conflict refresh failed: %s", e)
             
-        except Exception as e:
-            logger.error(f"Error detecting conflicts: {str(e)}")
-            raise
+            self._refresh_requested.wait(interval)
+            self._refresh_requested.clear()
     
-    def detect_double_bookings(self) -> List[Dict]:
-        """Detect pilots or drones assigned to overlapping missions"""
+    def _publish(self, conflicts: Dict[str, List[Dict]], generation: int):
+        with self._latest_lock:
+            if generation == self._generation:
+                self._latest = conflicts
+    
+    def _on_sheet_update(self, sheet: str):
+        with self._latest_lock:
+            self._latest = None
+            self._generation += 1
+        self._refresh_requested.set()
+    
+    def detect_all_conflicts(self, snapshot: Optional[Dict[str, pd.DataFrame]] = None) -> Dict[str, List[Dict]]:
+        """Detect all types of conflicts, optionally from frames already read via SheetsService.get_all()
+        
+        The returned dict may be shared with other callers and must not be mutated.
+        """
         try:
-            missions_df = self.sheets.get_missions()
-            pilots_df = self.sheets.get_pilot_roster()
-            drones_df = self.sheets.get_drone_fleet()
+            # The three sheets arrive in parallel, so a cold scan waits for one round-trip
+            frames = snapshot or self.sheets.get_all()
+            frames = (frames['missions'], frames['pilots'], frames['drones'])
             
-            conflicts = []
+            # Same cached frames as last time, or refetched but identical: reuse that scan
+            memo = self._memo
+            if memo is not None and all(frame is seen for frame, seen in zip(frames, memo[0])):
+                return memo[2]
+            fingerprint = _fingerprint(frames)
+            if memo is not None and memo[1] == fingerprint:
+                self._memo = (frames, fingerprint, memo[2])
+                return memo[2]
             
-            # Convert date strings to datetime
-            missions_df['start_date'] = pd.to_datetime(missions_df['start_date'])
-            missions_df['end_date'] = pd.to_datetime(missions_df['end_date'])
+            # Mission intervals and assignment frames are built once, shared by every detector
+            snapshot = _Snapshot(*frames)
+            detectors = (
+                ("double_bookings", self._iter_double_bookings),
+                ("skill_mismatches", self._iter_skill_mismatches),
+                ("location_mismatches", self._iter_location_mismatches),
+                ("maintenance_conflicts", self._iter_maintenance_conflicts)
+            )
             
-            # Check pilot double-bookings
-            assigned_pilots = pilots_df[pilots_df['current_assignment'] != '–']
+            # Detectors only read the snapshot, so they can share it across threads
+            rows = len(snapshot.missions) + len(snapshot.pilots) + len(snapshot.drones)
+            if rows < PARALLEL_SCAN_MIN_ROWS:
+                results = [self._collect(detector, snapshot, key.replace('_', ' '))
+                           for key, detector in detectors]
+            else:
+                futures = [DETECTOR_POOL.submit(self._collect, detector, snapshot, key.replace('_', ' '))
+                           for key, detector in detectors]
+                results = [future.result() for future in futures]
             
-            for _, pilot in assigned_pilots.iterrows():
-                pilot_missions = missions_df[
-                    missions_df['project_id'] == pilot['current_assignment']
-                ]
-                
-                if len(pilot_missions) == 0:
-                    continue
-                
-                pilot_mission = pilot_missions.iloc[0]
-                
-                # Check for overlapping missions
-                overlapping = missions_df[
-                    (missions_df['project_id'] != pilot['current_assignment']) &
-                    (missions_df['start_date'] <= pilot_mission['end_date']) &
-                    (missions_df['end_date'] >= pilot_mission['start_date'])
-                ]
-                
-                if len(overlapping) > 0:
-                    conflicts.append({
-                        "type": "pilot_double_booking",
-                        "pilot_id": pilot['pilot_id'],
-                        "pilot_name": pilot['name'],
-                        "current_assignment": pilot['current_assignment'],
-                        "conflicting_missions": overlapping['project_id'].tolist(),
-                        "severity": "high"
-                    })
+            # Count while gathering instead of walking the lists again afterwards
+            conflicts = {}
+            total_conflicts = 0
+            for (key, _), result in zip(detectors, results):
+                conflicts[key] = result
+                total_conflicts += len(result)
             
-            # Check drone double-bookings (similar logic)
-            assigned_drones = drones_df[drones_df['current_assignment'] != '–']
-            
-            for _, drone in assigned_drones.iterrows():
-                drone_missions = missions_df[
-                    missions_df['project_id'] == drone['current_assignment']
-                ]
-                
-                if len(drone_missions) == 0:
-                    continue
-                
-                drone_mission = drone_missions.iloc[0]
-                
-                overlapping = missions_df[
-                    (missions_df['project_id'] != drone['current_assignment']) &
-                    (missions_df['start_date'] <= drone_mission['end_date']) &
-                    (missions_df['end_date'] >= drone_mission['start_date'])
-                ]
-                
-                if len(overlapping) > 0:
-                    conflicts.append({
-                        "type": "drone_double_booking",
-                        "drone_id": drone['drone_id'],
-                        "current_assignment": drone['current_assignment'],
-                        "conflicting_missions": overlapping['project_id'].tolist(),
-                        "severity": "high"
-                    })
+            logger.info("Detected %s total conflicts", total_conflicts)
             
+            self._memo = (frames, fingerprint, conflicts)
             return conflicts
             
         except Exception as e:
-            logger.error(f"Error detecting double bookings: {str(e)}")
-            return []
+            logger.error("Error detecting conflicts: %s", e)
+            raise
     
-    def detect_skill_mismatches(self) -> List[Dict]:
-        """Detect assignments where pilot lacks required skills or certifications"""
+    def _take_snapshot(self) -> _Snapshot:
+        frames = self.sheets.get_all()
+        return _Snapshot(frames['missions'], frames['pilots'], frames['drones'])
+    
+    def _collect(self, detector: Callable[[_Snapshot], Iterator[Dict]],
+                 snapshot: Optional[_Snapshot], label: str) -> List[Dict]:
+        """Run one detector to completion; a detector that fails reports no conflicts"""
         try:
-            missions_df = self.sheets.get_missions()
-            pilots_df = self.sheets.get_pilot_roster()
-            
-            conflicts = []
-            
-            # Check each assigned pilot
-            assigned_pilots = pilots_df[pilots_df['current_assignment'] != '–']
-            
-            for _, pilot in assigned_pilots.iterrows():
-                # Get mission details
-                mission = missions_df[
-                    missions_df['project_id'] == pilot['current_assignment']
-                ]
-                
-                if len(mission) == 0:
-                    continue
-                
-                mission = mission.iloc[0]
-                
-                # Parse skills and certs
-                pilot_skills = set(str(pilot['skills']).split(', '))
-                pilot_certs = set(str(pilot['certifications']).split(', '))
-                
-                required_skills = set(str(mission['required_skills']).split(', '))
-                required_certs = set(str(mission['required_certs']).split(', '))
-                
-                # Check for missing skills
-                missing_skills = required_skills - pilot_skills
-                missing_certs = required_certs - pilot_certs
-                
-                if missing_skills or missing_certs:
-                    conflicts.append({
-                        "type": "skill_mismatch",
-                        "pilot_id": pilot['pilot_id'],
-                        "pilot_name": pilot['name'],
-                        "project_id": pilot['current_assignment'],
-                        "missing_skills": list(missing_skills),
-                        "missing_certifications": list(missing_certs),
-                        "severity": "high" if missing_certs else "medium"
-                    })
-            
-            return conflicts
-            
+            return list(detector(snapshot or self._take_snapshot()))
         except Exception as e:
-            logger.error(f"Error detecting skill mismatches: {str(e)}")
+            logger.error("Error detecting %s: %s", label, e)
             return []
     
-    def detect_location_mismatches(self) -> List[Dict]:
+    def detect_double_bookings(self, snapshot: Optional[_Snapshot] = None) -> List[Dict]:
+        """Detect pilots or drones assigned to overlapping missions"""
+        return self._collect(self._iter_double_bookings, snapshot, "double bookings")
+    
+    def detect_skill_mismatches(self, snapshot: Optional[_Snapshot] = None) -> List[Dict]:
+        """Detect assignments where pilot lacks required skills or certifications"""
+        return self._collect(self._iter_skill_mismatches, snapshot, "skill mismatches")
+    
+    def detect_location_mismatches(self, snapshot: Optional[_Snapshot] = None) -> List[Dict]:
         """Detect when pilot and drone are in different locations"""
-        try:
-            missions_df = self.sheets.get_missions()
-            pilots_df = self.sheets.get_pilot_roster()
-            drones_df = self.sheets.get_drone_fleet()
-            
-            conflicts = []
-            
-            # Check each mission
-            for _, mission in missions_df.iterrows():
-                project_id = mission['project_id']
-                mission_location = mission['location']
-                
-                # Find assigned pilot and drone
-                assigned_pilot = pilots_df[pilots_df['current_assignment'] == project_id]
-                assigned_drone = drones_df[drones_df['current_assignment'] == project_id]
-                
-                if len(assigned_pilot) > 0 and len(assigned_drone) > 0:
-                    pilot = assigned_pilot.iloc[0]
-                    drone = assigned_drone.iloc[0]
-                    
-                    # Check location mismatches
-                    if pilot['location'] != mission_location:
-                        conflicts.append({
-                            "type": "pilot_location_mismatch",
-                            "project_id": project_id,
-                            "pilot_id": pilot['pilot_id'],
-                            "pilot_location": pilot['location'],
-                            "mission_location": mission_location,
-                            "severity": "medium"
-                        })
-                    
-                    if drone['location'] != mission_location:
-                        conflicts.append({
-                            "type": "drone_location_mismatch",
-                            "project_id": project_id,
-                            "drone_id": drone['drone_id'],
-                            "drone_location": drone['location'],
-                            "mission_location": mission_location,
-                            "severity": "medium"
-                        })
-                    
-                    if pilot['location'] != drone['location']:
-                        conflicts.append({
-                            "type": "pilot_drone_location_mismatch",
-                            "project_id": project_id,
-                            "pilot_id": pilot['pilot_id'],
-                            "drone_id": drone['drone_id'],
-                            "pilot_location": pilot['location'],
-                            "drone_location": drone['location'],
-                            "severity": "low"
-                        })
-            
-            return conflicts
-            
-        except Exception as e:
-            logger.error(f"Error detecting location mismatches: {str(e)}")
-            return []
+        return self._collect(self._iter_location_mismatches, snapshot, "location mismatches")
     
-    def detect_maintenance_conflicts(self) -> List[Dict]:
+    def detect_maintenance_conflicts(self, snapshot: Optional[_Snapshot] = None) -> List[Dict]:
         """Detect drones assigned to missions while in maintenance"""
-        try:
-            drones_df = self.sheets.get_drone_fleet()
-            
-            conflicts = []
-            
-            # Check for drones in maintenance that are assigned
-            maintenance_drones = drones_df[
-                (drones_df['status'] == 'Maintenance') & 
-                (drones_df['current_assignment'] != '–')
-            ]
-            
-            for _, drone in maintenance_drones.iterrows():
-                conflicts.append({
-                    "type": "maintenance_conflict",
-                    "drone_id": drone['drone_id'],
-                    "current_assignment": drone['current_assignment'],
-                    "maintenance_due": drone['maintenance_due'],
-                    "severity": "high"
-                })
+        return self._collect(self._iter_maintenance_conflicts, snapshot, "maintenance conflicts")
+    
+    def _iter_double_bookings(self, snapshot: _Snapshot) -> Iterator[Dict]:
+        # Mission dates are parsed once per fetch (_start_ts/_end_ts) by SheetsService
+        yield from self._iter_entity_double_bookings(
+            snapshot, snapshot.assigned_pilots, 'pilot_id', 'pilot_double_booking', name_key='pilot_name'
+        )
+        yield from self._iter_entity_double_bookings(
+            snapshot, snapshot.assigned_drones, 'drone_id', 'drone_double_booking'
+        )
+    
+    def _iter_entity_double_bookings(self, snapshot: _Snapshot, assigned: pd.DataFrame,
+                                     id_col: str, type_label: str,
+                                     name_key: Optional[str] = None) -> Iterator[Dict]:
+        """Assigned pilots/drones whose mission overlaps another mission
+        
+        name_key, when given, reports the entity's 'name' column under that key.
+        """
+        # Assignment -> its mission's window (the first row for a project id, as before)
+        booked = assigned[[id_col, 'current_assignment'] + (['name'] if name_key else [])].merge(
+            snapshot.mission_by_project[['project_id', '_start_ts', '_end_ts']],
+            left_on='current_assignment', right_on='project_id', how='inner'
+        )
+        
+        # One interval-tree query per booked project, however many entities share it
+        project_ids = snapshot.missions['project_id'].to_numpy()
+        overlapping = {}
+        projects = booked.drop_duplicates('current_assignment')
+        for project, start, end in zip(projects['current_assignment'].tolist(),
+                                       projects['_start_ts'].tolist(), projects['_end_ts'].tolist()):
+            if not start <= end:
+                overlapping[project] = []
+                continue
+            mask = snapshot.intervals.overlaps(pd.Interval(start, end, closed='both'))
+            overlapping[project] = project_ids[mask & (project_ids != project)].tolist()
+        
+        names = booked['name'].tolist() if name_key else [None] * len(booked)
+        for entity_id, name, assignment in zip(
+                booked[id_col].tolist(), names, booked['current_assignment'].tolist()):
+            if not overlapping[assignment]:
+                continue
+            conflict = {"type": type_label, id_col: entity_id}
+            if name_key:
+                conflict[name_key] = name
+            conflict.update({
+                "current_assignment": assignment,
+                "conflicting_missions": overlapping[assignment],
+                "severity": "high"
+            })
+            yield conflict
+    
+    def _iter_skill_mismatches(self, snapshot: _Snapshot) -> Iterator[Dict]:
+        # Each assigned pilot joined to its mission (first row per project id); skill
+        # sets were split once per fetch by SheetsService
+        assignments = snapshot.assigned_pilots[
+            ['pilot_id', 'name', 'current_assignment', '_skills_set', '_certs_set']
+        ].merge(
+            snapshot.mission_by_project[['project_id', '_required_skills_set', '_required_certs_set']],
+            left_on='current_assignment', right_on='project_id', how='inner', validate='m:1'
+        )
+        
+        # Check for missing skills and certifications across every assignment at once
+        skills_held, skills_required, skill_names = _incidence(
+            assignments['_skills_set'].tolist(), assignments['_required_skills_set'].tolist()
+        )
+        certs_held, certs_required, cert_names = _incidence(
+            assignments['_certs_set'].tolist(), assignments['_required_certs_set'].tolist()
+        )
+        missing_skills = skills_required & ~skills_held
+        missing_certs = certs_required & ~certs_held
+        lacks_certs = missing_certs.any(axis=1)
+        
+        flagged = np.flatnonzero(missing_skills.any(axis=1) | lacks_certs)
+        for i, pilot_id, name, project_id in zip(
+                flagged, assignments['pilot_id'].to_numpy()[flagged],
+                assignments['name'].to_numpy()[flagged],
+                assignments['current_assignment'].to_numpy()[flagged]):
+            yield {
+                "type": "skill_mismatch",
+                "pilot_id": pilot_id,
+                "pilot_name": name,
+                "project_id": project_id,
+                "missing_skills": skill_names[missing_skills[i]].tolist(),
+                "missing_certifications": cert_names[missing_certs[i]].tolist(),
+                "severity": "high" if lacks_certs[i] else "medium"
+            }
+    
+    def _iter_location_mismatches(self, snapshot: _Snapshot) -> Iterator[Dict]:
+        # Each mission joined to the first pilot and first drone assigned to it
+        # (missions lacking either drop out, as before)
+        joined = snapshot.missions[['project_id', 'location']].merge(
+            snapshot.assigned_pilots[['current_assignment', 'pilot_id', 'location']]
+            .drop_duplicates('current_assignment')
+            .rename(columns={'current_assignment': 'project_id', 'location': 'pilot_location'}),
+            on='project_id', how='inner'
+        ).merge(
+            snapshot.assigned_drones[['current_assignment', 'drone_id', 'location']]
+            .drop_duplicates('current_assignment')
+            .rename(columns={'current_assignment': 'project_id', 'location': 'drone_location'}),
+            on='project_id', how='inner'
+        )
+        
+        # Compare as plain objects: the three sheets' categoricals have different categories
+        mission_locations = joined['location'].to_numpy(dtype=object)
+        pilot_locations = joined['pilot_location'].to_numpy(dtype=object)
+        drone_locations = joined['drone_location'].to_numpy(dtype=object)
+        pilot_away = pilot_locations != mission_locations
+        drone_away = drone_locations != mission_locations
+        apart = pilot_locations != drone_locations
+        
+        flagged = np.flatnonzero(pilot_away | drone_away | apart)
+        for i, project_id, pilot_id, drone_id in zip(
+                flagged, joined['project_id'].to_numpy()[flagged],
+                joined['pilot_id'].to_numpy()[flagged], joined['drone_id'].to_numpy()[flagged]):
+            # Check location mismatches
+            if pilot_away[i]:
+                yield {
+                    "type": "pilot_location_mismatch",
+                    "project_id": project_id,
+                    "pilot_id": pilot_id,
+                    "pilot_location": pilot_locations[i],
+                    "mission_location": mission_locations[i],
+                    "severity": "medium"
+                }
             
-            return conflicts
+            if drone_away[i]:
+                yield {
+                    "type": "drone_location_mismatch",
+                    "project_id": project_id,
+                    "drone_id": drone_id,
+                    "drone_location": drone_locations[i],
+                    "mission_location": mission_locations[i],
+                    "severity": "medium"
+                }
             
-        except Exception as e:
-            logger.error(f"Error detecting maintenance conflicts: {str(e)}")
-            return []
+            if apart[i]:
+                yield {
+                    "type": "pilot_drone_location_mismatch",
+                    "project_id": project_id,
+                    "pilot_id": pilot_id,
+                    "drone_id": drone_id,
+                    "pilot_location": pilot_locations[i],
+                    "drone_location": drone_locations[i],
+                    "severity": "low"
+                }
+    
+    def _iter_maintenance_conflicts(self, snapshot: _Snapshot) -> Iterator[Dict]:
+        assigned_drones = snapshot.assigned_drones
+        
+        # Check for drones in maintenance that are assigned; the conflict is just
+        # their row, so the records come straight from to_dict
+        maintenance_drones = assigned_drones.loc[
+            assigned_drones['status'] == 'Maintenance',
+            ['drone_id', 'current_assignment', 'maintenance_due']
+        ]
+        
+        for record in maintenance_drones.to_dict(orient='records'):
+            yield {"type": "maintenance_conflict", **record, "severity": "high"}
@@ -0,0 +1,110 @@
+import hashlib
+import threading
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """Semantic cache of agent replies keyed on message embeddings and sheet state"""
+
+    def __init__(self, sheets_service, embed_fn: Callable[[str], Sequence[float]],
+                 threshold: float = 0.92, max_entries: int = 256):
+        self.sheets = sheets_service
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_entries = max_entries
+
+        # Unit-normalised embeddings, one row per entry, so a lookup is one matmul
+        self._vectors: Optional[np.ndarray] = None
+        self._states: List[str] = []
+        self._responses: List[str] = []
+
+        # sheet name -> (frame, digest); a refetched frame is hashed again
+        self._frame_digests = {}
+        self._lock = threading.Lock()
+
+        # Re-asked questions skip the embedding call entirely
+        self._embed_normalized = lru_cache(maxsize=2048)(self._compute_embedding)
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed a message as a unit-length float32 vector (read-only, memoised)"""
+        return self._embed_normalized(text.strip().lower())
+
+    def _compute_embedding(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.embed_fn(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+        vector.setflags(write=False)
+        return vector
+
+    def sheets_state_hash(self) -> Optional[str]:
+        """Fingerprint of the pilot, drone and mission frames already in memory
+
+        Nothing is fetched, so the opening message never waits on a sheet read. A sheet
+        with no frame (never read, or dropped by a write) leaves the state unknown: None.
+        """
+        digest = hashlib.md5()
+        for name in ('pilots', 'drones', 'missions'):
+            df = self.sheets.cached_frame(name)
+            if df is None:
+                return None
+            digest.update(self._frame_digest(name, df))
+        return digest.hexdigest()
+
+    def _frame_digest(self, name: str, df: pd.DataFrame) -> bytes:
+        """Content hash of a frame, computed once per fetched frame"""
+        entry = self._frame_digests.get(name)
+        if entry is not None and entry[0] is df:
+            return entry[1]
+
+        # The sheets' own columns; the '_' ones are derived from them
+        columns = [col for col in df.columns if not str(col).startswith('_')]
+        frame_digest = hashlib.md5(
+            pd.util.hash_pandas_object(df[columns], index=False).values.tobytes()
+        ).digest()
+        self._frame_digests[name] = (df, frame_digest)
+        return frame_digest
+
+    def lookup(self, vector: np.ndarray, state_hash: str) -> Optional[str]:
+        """Return the cached reply for the most similar message, if close enough"""
+        with self._lock:
+            if self._vectors is None:
+                return None
+
+            similarities = self._vectors @ vector
+            states = np.asarray(self._states)
+            similarities[states != state_hash] = -1.0
+
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+
+            logger.info("Response cache hit (similarity %.3f)", similarities[best])
+            return self._responses[best]
+
+    def store(self, vector: np.ndarray, state_hash: str, response: str):
+        """Remember a reply, evicting the oldest entry when full"""
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = vector[np.newaxis, :]
+            else:
+                self._vectors = np.vstack([self._vectors, vector])
+            self._states.append(state_hash)
+            self._responses.append(response)
+
+            if len(self._responses) > self.max_entries:
+                self._vectors = self._vectors[1:]
+                del self._states[0]
+                del self._responses[0]
+
+    def clear(self):
+        """Drop every cached reply"""
+        with self._lock:
+            self._vectors = None
+            self._states = []
+            self._responses = []
@@ -1,101 +1,493 @@
 import gspread
+from gspread.utils import numericise_all, rowcol_to_a1
 from google.oauth2.service_account import Credentials
-from config import Config
+from config import get_config
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, reduce
+from itertools import chain
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CFG = get_config()
+
+# Seconds a fetched sheet is served from memory before re-reading Google Sheets;
+# writes through this service invalidate the sheet immediately
+SHEET_CACHE_TTL = CFG.SHEET_CACHE_TTL
+
+SHEET_NAMES = ('pilots', 'drones', 'missions')
+
+# One process-wide pool for outbound Sheets I/O (prefetches, parallel tool calls),
+# sized near the per-project read quota and shared by every conversation
+IO_POOL = ThreadPoolExecutor(max_workers=CFG.OPS_IO_WORKERS, thread_name_prefix='sheets-io')
+
+# Columns indexed for tool filters, per sheet: column -> is multi-valued (", " separated)
+FILTER_INDEX_COLUMNS = {
+    'pilots': {'skills': True, 'certifications': True, 'location': False, 'status': False},
+    'drones': {'capabilities': True, 'status': False, 'location': False},
+    'missions': {'priority': False, 'location': False}
+}
+
+# Low-cardinality columns stored as pandas categoricals (int codes, not strings);
+# current_assignment is mostly '–' plus a handful of project ids
+CATEGORICAL_COLUMNS = {
+    'pilots': ('status', 'location', 'current_assignment'),
+    'drones': ('status', 'location', 'current_assignment'),
+    'missions': ('priority', 'location')
+}
+
+# ", "-separated columns pre-split into frozensets, per sheet: column -> derived column
+SET_COLUMNS = {
+    'pilots': {'skills': '_skills_set', 'certifications': '_certs_set'},
+    'drones': {'capabilities': '_capabilities_set'},
+    'missions': {'required_skills': '_required_skills_set', 'required_certs': '_required_certs_set'}
+}
+
+# The sheets hold ISO dates; an explicit format skips pandas' per-value format inference
+DATE_FORMAT = '%Y-%m-%d'
+
+# Date columns pre-parsed into Timestamps (NaT when blank or malformed)
+DATE_COLUMNS = {
+    'pilots': {'available_from': '_available_from_ts'},
+    'drones': {},
+    'missions': {'start_date': '_start_ts', 'end_date': '_end_ts'}
+}
+
+# Status write targets per sheet: (entity label, status column, current_assignment column);
+# columns are 1-based and follow the layouts documented in update_*_status
+STATUS_COLUMNS = {
+    'pilots': ('Pilot', 6, 7),
+    'drones': ('Drone', 4, 6)
+}
+
+# Filter spec entry: (column, value, 'contains' | 'equals'); falsy values are skipped
+FilterSpec = List[Tuple[str, Any, str]]
+
+def _parse_dates(column: pd.Series) -> pd.Series:
+    """Parse a date column as DATE_FORMAT, inferring the format only for cells that don't match"""
+    parsed = pd.to_datetime(column, format=DATE_FORMAT, errors='coerce', cache=True)
+    unmatched = parsed.isna() & column.notna() & (column.astype(str) != '')
+    if unmatched.any():
+        # Hand-entered cells in another layout parse as before instead of becoming NaT
+        parsed[unmatched] = pd.to_datetime(column[unmatched], format='mixed', errors='coerce')
+    return parsed
+
+def _frame_from_values(values: List[List[str]]) -> pd.DataFrame:
+    """DataFrame from get_all_values(): a header row, then every cell as a string
+    
+    Built column-wise by pandas rather than via get_all_records' dict per row.
+    """
+    if not values:
+        return pd.DataFrame()
+    
+    # Numericised cell by cell, as get_all_records did: numbers become int or float and
+    # blanks stay '', rather than a whole column turning to floats and NaN
+    return pd.DataFrame([numericise_all(row) for row in values[1:]], columns=values[0])
+
+@lru_cache(maxsize=1)
+def _get_gspread_client() -> gspread.Client:
+    """Authorized Sheets client, built once per process from the service account"""
+    scopes = [
+        'https://www.googleapis.com/auth/spreadsheets',
+        'https://www.googleapis.com/auth/drive'
+    ]
+    
+    creds = Credentials.from_service_account_file(
+        CFG.GOOGLE_CREDENTIALS_PATH,
+        scopes=scopes
+    )
+    
+    return gspread.authorize(creds)
+
+@lru_cache(maxsize=None)
+def _open_worksheet(sheet_id: str) -> gspread.Worksheet:
+    """First worksheet of a spreadsheet; open_by_key's metadata round trip happens once"""
+    return _get_gspread_client().open_by_key(sheet_id).get_worksheet(0)
+
+class FilterIndex:
+    """Token x row bitmaps (8 rows per byte) for one sheet's filterable columns"""
+    
+    def __init__(self, df: pd.DataFrame, columns: Dict[str, bool]):
+        self.n_rows = len(df)
+        self.vocab = {}
+        self.positions = {}
+        self.bits = {}
+        for col, multi_valued in columns.items():
+            if not multi_valued and isinstance(df[col].dtype, pd.CategoricalDtype):
+                self._index_categorical(col, df[col])
+                continue
+            
+            values = df[col].astype(object).where(df[col].notna(), '')
+            row_tokens = [
+                [t.strip().lower() for t in (str(v).split(',') if multi_valued else [str(v)]) if t.strip()]
+                for v in values
+            ]
+            tokens = sorted(set(chain.from_iterable(row_tokens)))
+            position = {token: i for i, token in enumerate(tokens)}
+            
+            onehot = np.zeros((len(tokens), self.n_rows), dtype=bool)
+            for row, toks in enumerate(row_tokens):
+                onehot[[position[t] for t in toks], row] = True
+            
+            # Lowered once here, so lookups never touch the frame's strings again
+            self.vocab[col] = np.array(tokens, dtype=str)
+            self.positions[col] = position
+            self.bits[col] = np.packbits(onehot, axis=1)
+    
+    def _index_categorical(self, col: str, column: pd.Series):
+        """Bitmaps straight from a categorical's integer codes, without touching row strings"""
+        labels = [str(category).strip().lower() for category in column.cat.categories]
+        tokens = sorted({label for label in labels if label})
+        position = {token: i for i, token in enumerate(tokens)}
+        
+        # Category code -> token row (categories differing only in case share one); -1 = none
+        code_to_token = np.array([position.get(label, -1) for label in labels] + [-1], dtype=np.intp)
+        token_rows = code_to_token[column.cat.codes.to_numpy()]  # NaN code -1 hits the sentinel
+        present = np.flatnonzero(token_rows >= 0)
+        
+        onehot = np.zeros((len(tokens), self.n_rows), dtype=bool)
+        onehot[token_rows[present], present] = True
+        
+        self.vocab[col] = np.array(tokens, dtype=str)
+        self.positions[col] = position
+        self.bits[col] = np.packbits(onehot, axis=1)
+    
+    def mask(self, col: str, value: Any, kind: str) -> np.ndarray:
+        """Packed row bitmap for one filter ('contains' or 'equals', case-insensitive)"""
+        value = str(value).strip().lower()
+        if kind == 'equals':
+            hits = [self.positions[col][value]] if value in self.positions[col] else []
+        else:
+            # Substring semantics: any token containing the value matches (plain
+            # substring search over the vocabulary, no regex)
+            hits = np.flatnonzero(np.char.find(self.vocab[col], value) >= 0)
+        
+        if not len(hits):
+            return np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        return np.bitwise_or.reduce(self.bits[col][hits], axis=0)
+    
+    def select(self, spec: FilterSpec) -> np.ndarray:
+        """Row positions matching every filter in the spec"""
+        mask = reduce(np.bitwise_and, (self.mask(col, value, kind) for col, value, kind in spec))
+        return np.flatnonzero(np.unpackbits(mask, count=self.n_rows))
+
 class SheetsService:
     """Service for interacting with Google Sheets"""
     
     def __init__(self):
         """Initialize Google Sheets client"""
         try:
-            scopes = [
-                'https://www.googleapis.com/auth/spreadsheets',
-                'https://www.googleapis.com/auth/drive'
-            ]
+            # Shared across instances: credentials are read and authorized once
+            self.client = _get_gspread_client()
             
-            creds = Credentials.from_service_account_file(
-                Config.GOOGLE_CREDENTIALS_PATH,
-                scopes=scopes
-            )
+            # sheet name -> (fetched_at, DataFrame); one lock per sheet so concurrent
+            # tool calls wait for a single in-flight fetch instead of duplicating it
+            self._cache = {}
+            self._cache_locks = {name: threading.Lock() for name in SHEET_NAMES}
+            
+            # Bumped whenever a sheet's cached frame is replaced or dropped, so
+            # results derived from a frame can be keyed on (sheet, version)
+            self._versions = dict.fromkeys(SHEET_NAMES, 0)
+            
+            # sheet name -> (frame the index was built from, FilterIndex)
+            self._filter_indexes = {}
             
-            self.client = gspread.authorize(creds)
+            # sheet name -> (frame the payload was built from, JSON records string)
+            self._json_payloads = {}
+            
+            # sheet name -> (fetched_at, {entity id: sheet row}), kept with the cached frame
+            self._row_indexes = {}
+            
+            # Callbacks run with the sheet name after each successful write
+            self._update_listeners = []
             logger.info("Google Sheets client initialized successfully")
             
         except Exception as e:
-            logger.error(f"Failed to initialize Google Sheets client: {str(e)}")
+            logger.error("Failed to initialize Google Sheets client: %s", e)
             raise
     
+    def _cached(self, name: str, fetch: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """Serve a sheet from memory while fresh, otherwise fetch and remember it"""
+        entry = self._cache.get(name)
+        if entry is not None and time.monotonic() - entry[0] < SHEET_CACHE_TTL:
+            return entry[1]
+        
+        with self._cache_locks[name]:
+            entry = self._cache.get(name)
+            if entry is not None and time.monotonic() - entry[0] < SHEET_CACHE_TTL:
+                return entry[1]
+            
+            version = self._versions[name]
+            df = self._prepare(name, fetch())
+            # A write invalidated the sheet mid-fetch; the frame may predate it, so
+            # serve it to this caller only and let the next read fetch again
+            if self._versions[name] != version:
+                return df
+            
+            fetched_at = time.monotonic()
+            self._index_rows(name, df, fetched_at)
+            self._cache[name] = (fetched_at, df)
+            self._versions[name] += 1
+            return df
+    
+    def _index_rows(self, name: str, df: pd.DataFrame, fetched_at: float):
+        """Remember which sheet row holds each id, so writes read back single cells, not column A"""
+        if name not in STATUS_COLUMNS:
+            return
+        id_col = f"{STATUS_COLUMNS[name][0].lower()}_id"
+        if id_col in df.columns:
+            # Row 1 is the header, so frame position i is sheet row i + 2
+            self._row_indexes[name] = (
+                fetched_at, {str(value): i for i, value in enumerate(df[id_col], start=2)}
+            )
+    
+    def _find_rows(self, name: str, ids: List[str], worksheet) -> Dict[str, int]:
+        """Sheet rows holding the given ids (missing ids are absent from the result)
+        
+        Rows come from the fetched frame while it is fresh, confirmed by reading back just
+        those id cells, since rows may have been inserted or deleted by hand since the
+        fetch; otherwise column A is read in full.
+        
+        So a write still costs one lookup round trip, deliberately: the index saves reading
+        the whole id column, not the read itself. Sheets has no conditional write, and a
+        wrong row could only be spotted after another pilot's status was overwritten.
+        """
+        indexed = self._row_indexes.get(name)
+        if indexed is not None and time.monotonic() - indexed[0] < SHEET_CACHE_TTL:
+            rows = {entity_id: indexed[1][entity_id] for entity_id in ids if entity_id in indexed[1]}
+            if rows and len(rows) == len(set(ids)):
+                cells = worksheet.batch_get([rowcol_to_a1(row, 1) for row in rows.values()])
+                if all(cell and cell[0] and str(cell[0][0]) == entity_id
+                       for cell, entity_id in zip(cells, rows)):
+                    return rows
+        
+        return {value: i for i, value in enumerate(worksheet.col_values(1), start=1)}
+    
+    def is_fresh(self, name: str) -> bool:
+        """Whether a sheet would be served from memory right now"""
+        entry = self._cache.get(name)
+        return entry is not None and time.monotonic() - entry[0] < SHEET_CACHE_TTL
+    
+    def cached_frame(self, name: str) -> Optional[pd.DataFrame]:
+        """The last fetched frame for a sheet however old, or None; never fetches"""
+        entry = self._cache.get(name)
+        return entry[1] if entry is not None else None
+    
+    def version(self, name: str) -> int:
+        """Counter that changes whenever the sheet's cached data may have changed"""
+        return self._versions[name]
+    
+    @staticmethod
+    def _prepare(name: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Derive the in-memory layout of a freshly fetched sheet
+        
+        Derived columns are prefixed with '_' and never leave the service as JSON.
+        """
+        for col in CATEGORICAL_COLUMNS[name]:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        for col, derived in SET_COLUMNS[name].items():
+            if col in df.columns:
+                df[derived] = pd.Series([frozenset(str(value).split(', ')) for value in df[col]],
+                                        index=df.index, dtype=object)
+        for col, derived in DATE_COLUMNS[name].items():
+            if col in df.columns:
+                df[derived] = _parse_dates(df[col])
+        return df
+    
+    def invalidate(self, name: Optional[str] = None):
+        """Drop the cached frame (and its filter and row indexes) for one sheet, or all of them"""
+        for sheet in ([name] if name else SHEET_NAMES):
+            self._cache.pop(sheet, None)
+            self._row_indexes.pop(sheet, None)
+            self._versions[sheet] += 1
+            self._filter_indexes.pop(sheet, None)
+            self._json_payloads.pop(sheet, None)
+    
+    def refresh(self, name: Optional[str] = None):
+        """Drop cached data for one sheet (or all) and notify listeners, e.g. after hand edits"""
+        for sheet in ([name] if name else SHEET_NAMES):
+            self._notify_update(sheet)
+    
+    def add_update_listener(self, listener: Callable[[str], None]):
+        """Register a callback invoked with the sheet name after each write"""
+        self._update_listeners.append(listener)
+    
+    def _notify_update(self, name: str):
+        self.invalidate(name)
+        for listener in self._update_listeners:
+            listener(name)
+    
+    def ping(self, max_age: float = 60) -> Dict[str, int]:
+        """Cheap health probe: reuse a recent pilot fetch, re-reading at most once per max_age"""
+        entry = self._cache.get('pilots')
+        if entry is not None and time.monotonic() - entry[0] < max_age:
+            return {"pilots": len(entry[1])}
+        return {"pilots": len(self.get_pilot_roster())}
+    
+    def get_all(self) -> Dict[str, pd.DataFrame]:
+        """All three sheets, with stale ones fetched concurrently on IO_POOL"""
+        readers = {
+            'pilots': self.get_pilot_roster,
+            'drones': self.get_drone_fleet,
+            'missions': self.get_missions
+        }
+        stale = [name for name in SHEET_NAMES if not self.is_fresh(name)]
+        
+        # Already on a pool worker (e.g. inside a tool call): waiting on sibling
+        # tasks could starve the pool, so read in turn instead
+        if len(stale) < 2 or threading.current_thread().name.startswith('sheets-io'):
+            return {name: readers[name]() for name in SHEET_NAMES}
+        
+        # This thread reads the first stale sheet (and any fresh ones) meanwhile
+        futures = {name: IO_POOL.submit(readers[name]) for name in stale[1:]}
+        frames = {name: readers[name]() for name in SHEET_NAMES if name not in futures}
+        frames.update((name, future.result()) for name, future in futures.items())
+        return {name: frames[name] for name in SHEET_NAMES}
+    
     def get_pilot_roster(self) -> pd.DataFrame:
+        """Read pilot roster (cached for SHEET_CACHE_TTL seconds)"""
+        return self._cached('pilots', self._fetch_pilot_roster)
+    
+    def get_drone_fleet(self) -> pd.DataFrame:
+        """Read drone fleet (cached for SHEET_CACHE_TTL seconds)"""
+        return self._cached('drones', self._fetch_drone_fleet)
+    
+    def get_missions(self) -> pd.DataFrame:
+        """Read missions (cached for SHEET_CACHE_TTL seconds)"""
+        return self._cached('missions', self._fetch_missions)
+    
+    def _fetch_pilot_roster(self) -> pd.DataFrame:
         """Read pilot roster from Google Sheets"""
         try:
-            sheet = self.client.open_by_key(Config.PILOT_ROSTER_SHEET_ID)
-            worksheet = sheet.get_worksheet(0)
-            data = worksheet.get_all_records()
-            df = pd.DataFrame(data)
-            logger.info(f"Retrieved {len(df)} pilots from roster")
+            worksheet = _open_worksheet(CFG.PILOT_ROSTER_SHEET_ID)
+            df = _frame_from_values(worksheet.get_all_values())
+            logger.info("Retrieved %s pilots from roster", len(df))
             return df
         except Exception as e:
-            logger.error(f"Error reading pilot roster: {str(e)}")
+            logger.error("Error reading pilot roster: %s", e)
             raise Exception(f"Error reading pilot roster: {str(e)}")
     
-    def get_drone_fleet(self) -> pd.DataFrame:
+    def _fetch_drone_fleet(self) -> pd.DataFrame:
         """Read drone fleet from Google Sheets"""
         try:
-            sheet = self.client.open_by_key(Config.DRONE_FLEET_SHEET_ID)
-            worksheet = sheet.get_worksheet(0)
-            data = worksheet.get_all_records()
-            df = pd.DataFrame(data)
-            logger.info(f"Retrieved {len(df)} drones from fleet")
+            worksheet = _open_worksheet(CFG.DRONE_FLEET_SHEET_ID)
+            df = _frame_from_values(worksheet.get_all_values())
+            logger.info("Retrieved %s drones from fleet", len(df))
             return df
         except Exception as e:
-            logger.error(f"Error reading drone fleet: {str(e)}")
+            logger.error("Error reading drone fleet: %s", e)
             raise Exception(f"Error reading drone fleet: {str(e)}")
     
-    def get_missions(self) -> pd.DataFrame:
+    def _fetch_missions(self) -> pd.DataFrame:
         """Read missions from Google Sheets"""
         try:
-            sheet = self.client.open_by_key(Config.MISSIONS_SHEET_ID)
-            worksheet = sheet.get_worksheet(0)
-            data = worksheet.get_all_records()
-            df = pd.DataFrame(data)
-            logger.info(f"Retrieved {len(df)} missions")
+            worksheet = _open_worksheet(CFG.MISSIONS_SHEET_ID)
+            df = _frame_from_values(worksheet.get_all_values())
+            logger.info("Retrieved %s missions", len(df))
             return df
         except Exception as e:
-            logger.error(f"Error reading missions: {str(e)}")
+            logger.error("Error reading missions: %s", e)
             raise Exception(f"Error reading missions: {str(e)}")
     
+    def get_pilot_roster_json(self) -> str:
+        """Pilot roster as a JSON array of records"""
+        return self.get_sheet_json('pilots', self.get_pilot_roster())
+    
+    def get_drone_fleet_json(self) -> str:
+        """Drone fleet as a JSON array of records"""
+        return self.get_sheet_json('drones', self.get_drone_fleet())
+    
+    def get_missions_json(self) -> str:
+        """Missions as a JSON array of records"""
+        return self.get_sheet_json('missions', self.get_missions())
+    
+    def get_sheet_json(self, name: str, df: pd.DataFrame) -> str:
+        """JSON records for a frame; the full cached sheet is encoded once per fetch"""
+        cached = self._json_payloads.get(name)
+        if cached is not None and cached[0] is df:
+            return cached[1]
+        
+        public = df[[col for col in df.columns if not str(col).startswith('_')]]
+        payload = public.to_json(orient='records', date_format='iso')
+        entry = self._cache.get(name)
+        if entry is not None and entry[1] is df:
+            self._json_payloads[name] = (df, payload)
+        return payload
+    
+    def filter_pilots(self, skill: Optional[str] = None, certification: Optional[str] = None,
+                      location: Optional[str] = None, status: Optional[str] = None) -> pd.DataFrame:
+        """Pilots matching every given filter (substring for skill/cert/location)"""
+        return self._filter('pilots', self.get_pilot_roster(), [
+            ('skills', skill, 'contains'),
+            ('certifications', certification, 'contains'),
+            ('location', location, 'contains'),
+            ('status', status, 'equals')
+        ])
+    
+    def filter_drones(self, capability: Optional[str] = None, status: Optional[str] = None,
+                      location: Optional[str] = None) -> pd.DataFrame:
+        """Drones matching every given filter (substring for capability/location)"""
+        return self._filter('drones', self.get_drone_fleet(), [
+            ('capabilities', capability, 'contains'),
+            ('status', status, 'equals'),
+            ('location', location, 'contains')
+        ])
+    
+    def filter_missions(self, priority: Optional[str] = None,
+                        location: Optional[str] = None) -> pd.DataFrame:
+        """Missions matching every given filter (substring for location)"""
+        return self._filter('missions', self.get_missions(), [
+            ('priority', priority, 'equals'),
+            ('location', location, 'contains')
+        ])
+    
+    def _filter(self, name: str, df: pd.DataFrame, spec: FilterSpec) -> pd.DataFrame:
+        active = [(col, value, kind) for col, value, kind in spec if value]
+        if not active:
+            return df
+        return df.iloc[self.get_filter_index(name, df).select(active)]
+    
+    def get_filter_index(self, name: str, df: pd.DataFrame) -> FilterIndex:
+        """Filter index for a frame returned by one of the get_* readers, built once per frame"""
+        cached = self._filter_indexes.get(name)
+        if cached is not None and cached[0] is df:
+            return cached[1]
+        
+        index = FilterIndex(df, FILTER_INDEX_COLUMNS[name])
+        self._filter_indexes[name] = (df, index)
+        return index
+    
     def update_pilot_status(self, pilot_id: str, new_status: str, 
                            current_assignment: Optional[str] = None) -> Dict:
         """Update pilot status in Google Sheets"""
         try:
-            sheet = self.client.open_by_key(Config.PILOT_ROSTER_SHEET_ID)
-            worksheet = sheet.get_worksheet(0)
+            worksheet = _open_worksheet(CFG.PILOT_ROSTER_SHEET_ID)
             
             # Find the pilot row
-            cell = worksheet.find(pilot_id)
-            if not cell:
+            row = self._find_rows('pilots', [pilot_id], worksheet).get(pilot_id)
+            if row is None:
                 raise ValueError(f"Pilot {pilot_id} not found")
             
-            row = cell.row
-            
             # Column mapping (adjust based on your sheet structure)
             # Assuming: A=pilot_id, B=name, C=skills, D=certs, E=location, 
             #           F=status, G=current_assignment, H=available_from
             
-            # Update status (column F)
-            worksheet.update_cell(row, 6, new_status)
-            logger.info(f"Updated pilot {pilot_id} status to {new_status}")
-            
-            # Update assignment if provided (column G)
+            # Status (column F) and, if provided, assignment (column G) in one request
+            updates = [{'range': rowcol_to_a1(row, 6), 'values': [[new_status]]}]
+            if current_assignment is not None:
+                updates.append({'range': rowcol_to_a1(row, 7), 'values': [[current_assignment]]})
+            worksheet.batch_update(updates, value_input_option='USER_ENTERED')
+            logger.info("Updated pilot %s status to %s", pilot_id, new_status)
             if current_assignment is not None:
-                worksheet.update_cell(row, 7, current_assignment)
-                logger.info(f"Updated pilot {pilot_id} assignment to {current_assignment}")
+                logger.info("Updated pilot %s assignment to %s", pilot_id, current_assignment)
+            
+            self._notify_update('pilots')
             
             return {
                 "success": True, 
@@ -106,35 +498,34 @@ class SheetsService:
             }
             
         except Exception as e:
-            logger.error(f"Error updating pilot status: {str(e)}")
+            logger.error("Error updating pilot status: %s", e)
             raise Exception(f"Error updating pilot status: {str(e)}")
     
     def update_drone_status(self, drone_id: str, new_status: str, 
                            current_assignment: Optional[str] = None) -> Dict:
         """Update drone status in Google Sheets"""
         try:
-            sheet = self.client.open_by_key(Config.DRONE_FLEET_SHEET_ID)
-            worksheet = sheet.get_worksheet(0)
+            worksheet = _open_worksheet(CFG.DRONE_FLEET_SHEET_ID)
             
             # Find the drone row
-            cell = worksheet.find(drone_id)
-            if not cell:
+            row = self._find_rows('drones', [drone_id], worksheet).get(drone_id)
+            if row is None:
                 raise ValueError(f"Drone {drone_id} not found")
             
-            row = cell.row
-            
             # Column mapping (adjust based on your sheet structure)
             # Assuming: A=drone_id, B=model, C=capabilities, D=status, 
             #           E=location, F=current_assignment, G=maintenance_due
             
-            # Update status (column D)
-            worksheet.update_cell(row, 4, new_status)
-            logger.info(f"Updated drone {drone_id} status to {new_status}")
-            
-            # Update assignment if provided (column F)
+            # Status (column D) and, if provided, assignment (column F) in one request
+            updates = [{'range': rowcol_to_a1(row, 4), 'values': [[new_status]]}]
             if current_assignment is not None:
-                worksheet.update_cell(row, 6, current_assignment)
-                logger.info(f"Updated drone {drone_id} assignment to {current_assignment}")
+                updates.append({'range': rowcol_to_a1(row, 6), 'values': [[current_assignment]]})
+            worksheet.batch_update(updates, value_input_option='USER_ENTERED')
+            logger.info("Updated drone %s status to %s", drone_id, new_status)
+            if current_assignment is not None:
+                logger.info("Updated drone %s assignment to %s", drone_id, current_assignment)
+            
+            self._notify_update('drones')
             
             return {
                 "success": True,
@@ -145,9 +536,55 @@ class SheetsService:
             }
             
         except Exception as e:
-            logger.error(f"Error updating drone status: {str(e)}")
+            logger.error("Error updating drone status: %s", e)
             raise Exception(f"Error updating drone status: {str(e)}")
     
+    def batch_update_statuses(self, name: str, updates: List[Dict]) -> List[Dict]:
+        """Apply several status updates to one sheet in a single write request
+        
+        Each update is {"id", "new_status", "current_assignment"}; results come back in
+        the same order, with {"error": ...} for ids that are not in the sheet.
+        """
+        label, status_col, assignment_col = STATUS_COLUMNS[name]
+        sheet_id = {'pilots': CFG.PILOT_ROSTER_SHEET_ID, 'drones': CFG.DRONE_FLEET_SHEET_ID}[name]
+        id_key = f"{label.lower()}_id"
+        try:
+            worksheet = _open_worksheet(sheet_id)
+            
+            # One id lookup for every update instead of a find() each
+            rows = self._find_rows(name, [update['id'] for update in updates], worksheet)
+            
+            data = []
+            results = []
+            for update in updates:
+                row = rows.get(update['id'])
+                if row is None:
+                    results.append({"error": f"{label} {update['id']} not found"})
+                    continue
+                
+                data.append({'range': rowcol_to_a1(row, status_col), 'values': [[update['new_status']]]})
+                if update.get('current_assignment') is not None:
+                    data.append({'range': rowcol_to_a1(row, assignment_col),
+                                 'values': [[update['current_assignment']]]})
+                results.append({
+                    "success": True,
+                    "message": f"Updated {label.lower()} {update['id']}",
+                    id_key: update['id'],
+                    "new_status": update['new_status'],
+                    "current_assignment": update.get('current_assignment')
+                })
+            
+            if data:
+                worksheet.batch_update(data, value_input_option='USER_ENTERED')
+                logger.info("Batch-updated %s %s rows", len(data), name)
+                self._notify_update(name)
+            
+            return results
+            
+        except Exception as e:
+            logger.error("Error batch-updating %s statuses: %s", name, e)
+            raise Exception(f"Error batch-updating {name} statuses: {str(e)}")
+    
     def assign_pilot_to_mission(self, pilot_id: str, project_id: str) -> Dict:
         """Assign a pilot to a mission"""
         return self.update_pilot_status(
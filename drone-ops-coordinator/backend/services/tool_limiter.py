@@ -0,0 +1,94 @@
+import threading
+import time
+from typing import Dict
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Allow `rate` acquisitions per `per` seconds, bursting up to `rate` at once"""
+
+    def __init__(self, rate: float, per: float = 60.0):
+        self.capacity = float(rate)
+        self.fill_rate = rate / per
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float) -> bool:
+        """Take one token, waiting up to timeout seconds for one to accrue"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.fill_rate
+
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+class ToolLimiter:
+    """Per-tool call rates and time budgets for agent tool execution
+
+    Concurrency itself is bounded by the worker pool the tools run on; this adds
+    a calls-per-minute cap per tool (so parallel turns stay inside the Sheets
+    quotas) and the timeout after which a call's result is given up on.
+    """
+
+    def __init__(self, calls_per_min: Dict[str, float], timeouts: Dict[str, float],
+                 default_calls_per_min: float, default_timeout: float):
+        self.calls_per_min = calls_per_min
+        self.timeouts = timeouts
+        self.default_calls_per_min = default_calls_per_min
+        self.default_timeout = default_timeout
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def timeout(self, tool_name: str) -> float:
+        """Seconds a call to this tool may take before it is reported as timed out"""
+        return self.timeouts.get(tool_name, self.default_timeout)
+
+    def acquire(self, tool_name: str) -> bool:
+        """Wait for the tool's rate budget; False if none frees up within its timeout"""
+        bucket = self._buckets.get(tool_name)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(tool_name, TokenBucket(
+                    self.calls_per_min.get(tool_name, self.default_calls_per_min)
+                ))
+
+        if not bucket.acquire(self.timeout(tool_name)):
+            logger.warning("Rate limit reached for tool %s", tool_name)
+            return False
+        return True
+
+class WriteFence:
+    """Agreement between a write job and its caller on whether the write may still happen
+
+    Whichever side moves first wins: the job calls begin() just before writing, the
+    caller calls abandon() when it stops waiting. A write that has begun is waited
+    for; one that was abandoned never starts.
+    """
+
+    def __init__(self):
+        self._state = None
+        self._lock = threading.Lock()
+
+    def begin(self) -> bool:
+        """Claim the write; False if the caller has already given up on it"""
+        with self._lock:
+            if self._state is None:
+                self._state = 'writing'
+            return self._state == 'writing'
+
+    def abandon(self) -> bool:
+        """Give up on the write; False if it has already begun"""
+        with self._lock:
+            if self._state is None:
+                self._state = 'abandoned'
+            return self._state == 'abandoned'
@@ -0,0 +1,95 @@
+import dataclasses
+import pytest
+from gspread.utils import a1_to_rowcol
+from services import sheets_service
+from services.sheets_service import SheetsService
+from services.assignment_service import AssignmentService
+from services.conflict_service import ConflictService
+
+# One authorized client and one sheet cache for the whole run, instead of a
+# cold SheetsService (credentials, auth, fresh fetches) per test
+
+@pytest.fixture(scope='session')
+def sheets():
+    return SheetsService()
+
+@pytest.fixture(scope='session')
+def assignment(sheets):
+    return AssignmentService(sheets)
+
+@pytest.fixture(scope='session')
+def conflict(sheets):
+    return ConflictService(sheets)
+
+# Offline fixtures: the same services over in-memory worksheets, no credentials needed
+
+PILOT_ROWS = [
+    ['pilot_id', 'name', 'skills', 'certifications', 'location', 'status', 'current_assignment', 'available_from'],
+    ['P001', 'Arjun', 'Mapping, Survey', 'DGCA, Night Ops', 'Bangalore', 'Available', '–', '2024-01-01'],
+    ['P002', 'Neha', 'Inspection', 'DGCA', 'Mumbai', 'Assigned', 'PRJ001', '2024-01-01'],
+    ['P003', 'Rohit', 'Mapping, Inspection, Thermal', 'DGCA', 'Bangalore', 'Assigned', 'PRJ002', '2024-01-01'],
+    ['P004', 'Sneha', 'Survey', 'DGCA, Night Ops', 'Bangalore', 'Available', '–', '2024-03-01'],
+    ['P005', 'Kiran', 'Thermal', 'DGCA', 'Chennai', 'Assigned', 'PRJ003', ''],
+]
+
+DRONE_ROWS = [
+    ['drone_id', 'model', 'capabilities', 'status', 'location', 'current_assignment', 'maintenance_due'],
+    ['D001', 'DJI M300', 'LiDAR, RGB', 'Available', 'Bangalore', '–', '2024-05-01'],
+    ['D002', 'DJI Mavic 3T', 'Thermal', 'Deployed', 'Mumbai', 'PRJ001', '2024-04-01'],
+    ['D003', 'DJI M30T', 'Thermal, RGB', 'Maintenance', 'Pune', 'PRJ002', '2024-02-01'],
+]
+
+# PRJ001 appears twice (the first row is the one detectors check) and PRJ003 has no dates
+MISSION_ROWS = [
+    ['project_id', 'client', 'location', 'required_skills', 'required_certs', 'start_date', 'end_date', 'priority'],
+    ['PRJ001', 'Client A', 'Bangalore', 'Mapping', 'DGCA', '2024-02-01', '2024-02-10', 'High'],
+    ['PRJ002', 'Client B', 'Mumbai', 'Inspection', 'DGCA, Night Ops', '2024-02-05', '2024-02-15', 'Urgent'],
+    ['PRJ003', 'Client C', 'Bangalore', 'Thermal', 'DGCA', '', '', 'Standard'],
+    ['PRJ001', 'Client A', 'Pune', 'Mapping', 'DGCA', '2024-06-01', '2024-06-05', 'High'],
+]
+
+class FakeWorksheet:
+    """In-memory stand-in for a gspread Worksheet: a grid of strings, header row first"""
+
+    def __init__(self, rows):
+        self.rows = [list(row) for row in rows]
+        self.writes = []
+
+    def get_all_values(self):
+        return [list(row) for row in self.rows]
+
+    def col_values(self, col):
+        return [row[col - 1] for row in self.rows if len(row) >= col]
+
+    def batch_get(self, ranges):
+        return [[[self._cell(*a1_to_rowcol(a1))]] for a1 in ranges]
+
+    def batch_update(self, data, value_input_option='RAW'):
+        self.writes.append(data)
+        for update in data:
+            row, col = a1_to_rowcol(update['range'])
+            self.rows[row - 1][col - 1] = update['values'][0][0]
+
+    def _cell(self, row, col):
+        if row > len(self.rows) or col > len(self.rows[row - 1]):
+            return ''
+        return self.rows[row - 1][col - 1]
+
+@pytest.fixture
+def worksheets():
+    return {
+        'pilots': FakeWorksheet(PILOT_ROWS),
+        'drones': FakeWorksheet(DRONE_ROWS),
+        'missions': FakeWorksheet(MISSION_ROWS)
+    }
+
+@pytest.fixture
+def offline_sheets(monkeypatch, worksheets):
+    cfg = dataclasses.replace(
+        sheets_service.CFG,
+        PILOT_ROSTER_SHEET_ID='pilots', DRONE_FLEET_SHEET_ID='drones', MISSIONS_SHEET_ID='missions'
+    )
+    monkeypatch.setattr(sheets_service, 'CFG', cfg)
+    monkeypatch.setattr(sheets_service, '_get_gspread_client', lambda: None)
+    monkeypatch.setattr(sheets_service, '_open_worksheet', worksheets.__getitem__)
+    return SheetsService()
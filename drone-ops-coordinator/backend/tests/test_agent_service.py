@@ -0,0 +1,39 @@
+import threading
+import time
+from types import SimpleNamespace
+from services import agent_service
+from services.agent_service import AgentService
+from services.assignment_service import AssignmentService
+from services.conflict_service import ConflictService
+
+def test_reads_see_writes_from_the_same_round(offline_sheets, worksheets, monkeypatch):
+    """A roster read asked for alongside a status change runs after it"""
+    monkeypatch.setattr(agent_service, '_get_genai_client', lambda: None)
+    agent = AgentService(offline_sheets, AssignmentService(offline_sheets), ConflictService(offline_sheets))
+
+    write = worksheets['pilots'].batch_update
+    def slow_write(*args, **kwargs):
+        time.sleep(0.05)
+        return write(*args, **kwargs)
+    worksheets['pilots'].batch_update = slow_write
+
+    roster, update = agent._execute_tools([
+        SimpleNamespace(name='get_pilot_roster', args={'status': 'On Leave'}),
+        SimpleNamespace(name='update_pilot_status', args={'pilot_id': 'P001', 'new_status': 'On Leave'}),
+    ])
+
+    assert update['pilot_id'] == 'P001'
+    assert '"P001"' in roster.json_str
+
+def test_history_compaction_waits_for_the_turn(offline_sheets, monkeypatch):
+    """Compaction runs after the turn releases its conversation, not before the reply"""
+    monkeypatch.setattr(agent_service, '_get_genai_client', lambda: None)
+    agent = AgentService(offline_sheets, AssignmentService(offline_sheets), ConflictService(offline_sheets))
+    compacted = threading.Event()
+    monkeypatch.setattr(agent, '_compact_history', lambda conversation: compacted.set())
+    conversation = SimpleNamespace(lock=threading.Lock())
+
+    with conversation.lock:
+        agent._finish_turn(conversation, None, False, "Done")
+        assert not compacted.wait(0.05)
+    assert compacted.wait(1)
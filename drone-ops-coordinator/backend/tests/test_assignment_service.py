@@ -0,0 +1,43 @@
+import pytest
+from services import assignment_service
+from services.assignment_service import AssignmentService
+
+def test_find_suitable_pilots_scores_and_order(offline_sheets):
+    """Only qualified pilots, best score first: availability, location, extra skills"""
+    pilots = AssignmentService(offline_sheets).find_suitable_pilots('PRJ001')
+    assert [(p['pilot_id'], p['score'], p['recommendation']) for p in pilots] == [
+        ('P001', 102, "Excellent match - Ready to deploy"),  # 50 + 30 + 20 + 2 (Survey)
+        ('P003', 74, "Qualified but not available"),         # 50 + 20 + 4 (Inspection, Thermal)
+    ]
+    assert pilots[0]['same_location'] is True and pilots[0]['is_available'] is True
+    assert sorted(pilots[1]['skills']) == ['Inspection', 'Mapping', 'Thermal']
+
+def test_find_suitable_pilots_availability_date(offline_sheets, worksheets):
+    """Pilots not available until after the mission starts lose the availability points"""
+    worksheets['missions'].rows[2][3:5] = ['Survey', 'DGCA, Night Ops']
+    pilots = AssignmentService(offline_sheets).find_suitable_pilots('PRJ002')
+    # P001 is available by 2024-02-05 (plus Mapping as an extra skill); P004 only from
+    # 2024-03-01; neither is in Mumbai
+    assert {p['pilot_id']: p['score'] for p in pilots} == {'P001': 82, 'P004': 50}
+
+def test_find_suitable_pilots_keeps_sheet_order_on_ties(offline_sheets, worksheets):
+    """Equal scores come back in roster order"""
+    worksheets['missions'].rows[1][3:5] = ['Survey', 'DGCA']
+    worksheets['pilots'].rows[4][2] = 'Survey, Thermal'
+    worksheets['pilots'].rows[4][7] = '2024-01-01'
+    pilots = AssignmentService(offline_sheets).find_suitable_pilots('PRJ001')
+    assert [(p['pilot_id'], p['score']) for p in pilots] == [('P001', 102), ('P004', 102)]
+
+def test_find_suitable_pilots_caps_results(offline_sheets, monkeypatch):
+    monkeypatch.setattr(assignment_service, 'MAX_MATCHES', 1)
+    pilots = AssignmentService(offline_sheets).find_suitable_pilots('PRJ001')
+    assert [p['pilot_id'] for p in pilots] == ['P001']
+
+def test_find_suitable_pilots_unknown_project(offline_sheets):
+    with pytest.raises(ValueError):
+        AssignmentService(offline_sheets).find_suitable_pilots('PRJ404')
+
+def test_find_suitable_drones(offline_sheets):
+    """Drones in maintenance are excluded; mapping missions want LiDAR"""
+    drones = AssignmentService(offline_sheets).find_suitable_drones('PRJ001')
+    assert [(d['drone_id'], d['score']) for d in drones] == [('D001', 100), ('D002', 0)]
@@ -0,0 +1,71 @@
+import pytest
+from services.conflict_service import ConflictService
+
+def test_double_bookings(offline_sheets):
+    """Overlaps are checked against each project's first mission row; blank dates never overlap"""
+    assert ConflictService(offline_sheets).detect_double_bookings() == [
+        {"type": "pilot_double_booking", "pilot_id": "P002", "pilot_name": "Neha",
+         "current_assignment": "PRJ001", "conflicting_missions": ["PRJ002"], "severity": "high"},
+        {"type": "pilot_double_booking", "pilot_id": "P003", "pilot_name": "Rohit",
+         "current_assignment": "PRJ002", "conflicting_missions": ["PRJ001"], "severity": "high"},
+        {"type": "drone_double_booking", "drone_id": "D002",
+         "current_assignment": "PRJ001", "conflicting_missions": ["PRJ002"], "severity": "high"},
+        {"type": "drone_double_booking", "drone_id": "D003",
+         "current_assignment": "PRJ002", "conflicting_missions": ["PRJ001"], "severity": "high"},
+    ]
+
+def test_skill_mismatches(offline_sheets):
+    """Missing certifications are high severity, missing skills alone medium"""
+    assert ConflictService(offline_sheets).detect_skill_mismatches() == [
+        {"type": "skill_mismatch", "pilot_id": "P002", "pilot_name": "Neha", "project_id": "PRJ001",
+         "missing_skills": ["Mapping"], "missing_certifications": [], "severity": "medium"},
+        {"type": "skill_mismatch", "pilot_id": "P003", "pilot_name": "Rohit", "project_id": "PRJ002",
+         "missing_skills": [], "missing_certifications": ["Night Ops"], "severity": "high"},
+    ]
+
+def test_location_mismatches(offline_sheets):
+    """One group per mission row (duplicate project ids included), only when a pilot and drone are both assigned"""
+    assert ConflictService(offline_sheets).detect_location_mismatches() == [
+        {"type": "pilot_location_mismatch", "project_id": "PRJ001", "pilot_id": "P002",
+         "pilot_location": "Mumbai", "mission_location": "Bangalore", "severity": "medium"},
+        {"type": "drone_location_mismatch", "project_id": "PRJ001", "drone_id": "D002",
+         "drone_location": "Mumbai", "mission_location": "Bangalore", "severity": "medium"},
+        {"type": "pilot_location_mismatch", "project_id": "PRJ002", "pilot_id": "P003",
+         "pilot_location": "Bangalore", "mission_location": "Mumbai", "severity": "medium"},
+        {"type": "drone_location_mismatch", "project_id": "PRJ002", "drone_id": "D003",
+         "drone_location": "Pune", "mission_location": "Mumbai", "severity": "medium"},
+        {"type": "pilot_drone_location_mismatch", "project_id": "PRJ002", "pilot_id": "P003",
+         "drone_id": "D003", "pilot_location": "Bangalore", "drone_location": "Pune", "severity": "low"},
+        {"type": "pilot_location_mismatch", "project_id": "PRJ001", "pilot_id": "P002",
+         "pilot_location": "Mumbai", "mission_location": "Pune", "severity": "medium"},
+        {"type": "drone_location_mismatch", "project_id": "PRJ001", "drone_id": "D002",
+         "drone_location": "Mumbai", "mission_location": "Pune", "severity": "medium"},
+    ]
+
+def test_maintenance_conflicts(offline_sheets):
+    """Assigned drones in maintenance"""
+    assert ConflictService(offline_sheets).detect_maintenance_conflicts() == [
+        {"type": "maintenance_conflict", "drone_id": "D003", "current_assignment": "PRJ002",
+         "maintenance_due": "2024-02-01", "severity": "high"},
+    ]
+
+def test_detect_all_conflicts_matches_detectors(offline_sheets):
+    """The combined scan returns each detector's list, and reuses it while the sheets are unchanged"""
+    conflict = ConflictService(offline_sheets)
+    conflicts = conflict.detect_all_conflicts()
+    assert conflicts == {
+        "double_bookings": conflict.detect_double_bookings(),
+        "skill_mismatches": conflict.detect_skill_mismatches(),
+        "location_mismatches": conflict.detect_location_mismatches(),
+        "maintenance_conflicts": conflict.detect_maintenance_conflicts()
+    }
+    assert conflict.detect_all_conflicts() is conflicts
+
+def test_empty_sheet_only_empties_its_detectors(offline_sheets, worksheets):
+    """A sheet with no header or rows doesn't take down the whole scan"""
+    worksheets['drones'].rows = []
+    conflicts = ConflictService(offline_sheets).detect_all_conflicts()
+    assert conflicts["double_bookings"] == []
+    assert conflicts["location_mismatches"] == []
+    assert conflicts["maintenance_conflicts"] == []
+    assert len(conflicts["skill_mismatches"]) == 2
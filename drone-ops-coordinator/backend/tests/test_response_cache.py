@@ -0,0 +1,24 @@
+from services.response_cache import ResponseCache
+
+def test_state_hash_never_fetches(offline_sheets, worksheets):
+    """The fingerprint covers frames already in memory; it is unknown until all three are"""
+    cache = ResponseCache(offline_sheets, embed_fn=lambda text: [1.0])
+    worksheets['pilots'].get_all_values = None  # any fetch would fail
+
+    assert cache.sheets_state_hash() is None
+    assert offline_sheets.cached_frame('pilots') is None
+
+def test_state_hash_follows_sheet_content(offline_sheets, worksheets):
+    cache = ResponseCache(offline_sheets, embed_fn=lambda text: [1.0])
+    offline_sheets.get_all()
+    state = cache.sheets_state_hash()
+
+    # Refetching unchanged sheets keeps the fingerprint; a write changes it
+    offline_sheets.invalidate()
+    offline_sheets.get_all()
+    assert cache.sheets_state_hash() == state
+
+    offline_sheets.update_pilot_status('P001', 'On Leave')
+    assert cache.sheets_state_hash() is None
+    offline_sheets.get_all()
+    assert cache.sheets_state_hash() not in (None, state)
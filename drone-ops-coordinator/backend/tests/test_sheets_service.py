@@ -0,0 +1,85 @@
+import json
+import pytest
+from services.sheets_service import FILTER_INDEX_COLUMNS, FilterIndex
+
+def test_filter_index_contains_and_equals(offline_sheets):
+    """'contains' matches substrings of any token, 'equals' whole values; both ignore case"""
+    pilots = offline_sheets.get_pilot_roster()
+    index = FilterIndex(pilots, FILTER_INDEX_COLUMNS['pilots'])
+
+    assert index.select([('skills', 'map', 'contains')]).tolist() == [0, 2]
+    assert index.select([('certifications', 'night', 'contains')]).tolist() == [0, 3]
+    assert index.select([('status', 'available', 'equals')]).tolist() == [0, 3]
+    assert index.select([('status', 'avail', 'equals')]).tolist() == []
+    assert index.select([('location', 'BANGALORE', 'contains'),
+                         ('skills', 'survey', 'contains')]).tolist() == [0, 3]
+
+def test_invalidation_during_fetch_is_not_cached(offline_sheets, worksheets):
+    """A write that lands while a read is fetching isn't masked by the older frame"""
+    worksheet = worksheets['pilots']
+    read = worksheet.get_all_values
+
+    def read_then_write():
+        values = read()
+        worksheet.rows[1][5] = 'On Leave'
+        offline_sheets.invalidate('pilots')
+        return values
+
+    worksheet.get_all_values = read_then_write
+    assert offline_sheets.get_pilot_roster()['status'].iloc[0] == 'Available'
+
+    worksheet.get_all_values = read
+    assert offline_sheets.get_pilot_roster()['status'].iloc[0] == 'On Leave'
+def test_filter_pilots_skips_empty_filters(offline_sheets):
+    assert offline_sheets.filter_pilots(skill='thermal', location=None)['pilot_id'].tolist() == ['P003', 'P005']
+    assert len(offline_sheets.filter_pilots()) == 5
+
+def test_sheet_json_for_empty_sheet(offline_sheets, worksheets):
+    """A sheet without header or rows serves an empty array"""
+    worksheets['drones'].rows = []
+    assert offline_sheets.get_drone_fleet_json() == '[]'
+
+def test_sheet_json_hides_derived_columns(offline_sheets):
+    assert '_skills_set' not in offline_sheets.get_pilot_roster_json()
+
+def test_batch_update_statuses_order_and_unknown_ids(offline_sheets, worksheets):
+    """Results follow the request order, unknown ids report an error, and one write is sent"""
+    results = offline_sheets.batch_update_statuses('pilots', [
+        {"id": "P004", "new_status": "Assigned", "current_assignment": "PRJ003"},
+        {"id": "P404", "new_status": "Assigned"},
+        {"id": "P001", "new_status": "On Leave"},
+    ])
+
+    assert [r.get('pilot_id', r.get('error')) for r in results] == ['P004', 'Pilot P404 not found', 'P001']
+    assert worksheets['pilots'].writes == [[
+        {'range': 'F5', 'values': [['Assigned']]},
+        {'range': 'G5', 'values': [['PRJ003']]},
+        {'range': 'F2', 'values': [['On Leave']]},
+    ]]
+
+def test_update_status_after_rows_move(offline_sheets, worksheets):
+    """Rows inserted by hand after a fetch don't redirect writes to another pilot"""
+    offline_sheets.get_pilot_roster()
+    worksheets['pilots'].rows.insert(1, ['P009', 'New', '', '', '', '', '–', ''])
+
+    offline_sheets.update_pilot_status('P002', 'On Leave')
+
+    assert worksheets['pilots'].writes[-1] == [{'range': 'F4', 'values': [['On Leave']]}]
+    assert worksheets['pilots'].rows[2][5] == 'Available'
+
+def test_update_unknown_pilot(offline_sheets):
+    with pytest.raises(Exception, match='P404 not found'):
+        offline_sheets.update_pilot_status('P404', 'Available')
+
+def test_sheet_json_keeps_cell_types(offline_sheets, worksheets):
+    """Numbers stay ints next to blank cells, and blanks stay empty strings"""
+    rows = worksheets['pilots'].rows
+    rows[0] += ['flight_hours', 'notes']
+    rows[1] += ['120', '']
+    rows[2] += ['', '']
+    for row in rows[3:]:
+        row += ['5', '']
+
+    pilots = json.loads(offline_sheets.get_pilot_roster_json())
+    assert [p['flight_hours'] for p in pilots] == [120, '', 5, 5, 5]
+    assert [p['notes'] for p in pilots] == [''] * 5
@@ -0,0 +1,30 @@
+import pytest
+from services.tool_limiter import TokenBucket, ToolLimiter, WriteFence
+
+def test_token_bucket_bursts_then_refuses():
+    """A full bucket allows `rate` calls at once, then refuses until tokens accrue"""
+    bucket = TokenBucket(rate=3, per=60)
+    assert [bucket.acquire(timeout=0) for _ in range(4)] == [True, True, True, False]
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(rate=1, per=0.05)
+    assert bucket.acquire(timeout=0)
+    assert bucket.acquire(timeout=1)
+
+def test_tool_limiter_per_tool_budgets():
+    """Each tool has its own bucket and timeout, with defaults for unlisted tools"""
+    limiter = ToolLimiter({'update_pilot_status': 1}, {'update_pilot_status': 0}, 100, 5)
+    assert limiter.timeout('update_pilot_status') == 0
+    assert limiter.timeout('get_missions') == 5
+    assert limiter.acquire('update_pilot_status')
+    assert not limiter.acquire('update_pilot_status')
+    assert limiter.acquire('get_missions')
+
+def test_write_fence_first_side_wins():
+    abandoned = WriteFence()
+    assert abandoned.abandon()
+    assert not abandoned.begin()
+
+    begun = WriteFence()
+    assert begun.begin()
+    assert not begun.abandon()
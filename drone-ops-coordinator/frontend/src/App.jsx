@@ -28,7 +28,7 @@ function App() {
     setIsLoading(true)
 
     try {
-      const response = await fetch('/api/chat', {
+      const response = await fetch('/api/chat/stream', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -36,17 +36,35 @@ function App() {
         body: JSON.stringify({ message: userMessage })
       })
 
-      const data = await response.json()
-
       if (!response.ok) {
+        const data = await response.json()
         throw new Error(data.error || 'Failed to get response')
       }
 
-      // Add assistant response
-      setMessages(prev => [...prev, {
-        role: 'assistant',
-        content: data.response
-      }])
+      // Add an empty assistant message and grow it as Server-Sent Events arrive
+      setMessages(prev => [...prev, { role: 'assistant', content: '' }])
+
+      const reader = response.body.getReader()
+      const decoder = new TextDecoder()
+      let buffer = ''
+
+      while (true) {
+        const { done, value } = await reader.read()
+        if (done) break
+
+        buffer += decoder.decode(value, { stream: true })
+        const events = buffer.split('\n\n')
+        buffer = events.pop()
+
+        for (const event of events) {
+          if (!event.startsWith('data: ')) continue
+          const { text } = JSON.parse(event.slice('data: '.length))
+          setMessages(prev => {
+            const last = prev[prev.length - 1]
+            return [...prev.slice(0, -1), { ...last, content: last.content + text }]
+          })
+        }
+      }
 
     } catch (err) {
       setError(err.message)